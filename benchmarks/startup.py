@@ -0,0 +1,101 @@
+# benchmarks/startup.py
+"""
+cli.py 시작 시간 벤치마크 (회귀 방지용)
+
+    python benchmarks/startup.py [--repeat 10] [--budget-ms 300]
+
+- --help / health 실행에서 무거운 모듈(pandas 등)이 import 되지 않는지 -X importtime 으로 확인
+- 각 명령의 실행 시간 중앙값이 예산(budget)을 넘지 않는지 확인
+- 참고용으로 기존 run_*.py 스크립트의 import 시간도 함께 출력
+하나라도 실패하면 종료 코드 1을 반환합니다. (CI/크론 배포 전 점검용)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 빠른 경로에서 import 되면 안 되는 모듈 (최상위 패키지명)
+HEAVY_MODULES = {'pandas', 'numpy', 'scipy', 'sqlalchemy', 'psycopg2', 'tqdm', 'requests', 'msgspec', 'orjson'}
+
+# 서브커맨드 import 없이 끝나야 하는 명령
+FAST_COMMANDS = [
+    ['--help'],
+    ['backfill', '--help'],
+    ['health'],
+]
+
+# 비교용: 기존 스크립트를 import 하는 비용
+REFERENCE_IMPORTS = ['run_daily_krx', 'run_weekly_analysis', 'run_dividend_scraper']
+
+
+def _run(args):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True)
+    return time.perf_counter() - start, proc
+
+
+def _imported_heavy_modules(cli_args):
+    """-X importtime 출력에서 import된 무거운 최상위 모듈 목록"""
+    _, proc = _run(['-X', 'importtime', 'cli.py', *cli_args])
+    found = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        name = line.rsplit('|', 1)[1].strip().split('.')[0]
+        if name in HEAVY_MODULES:
+            found.add(name)
+    return sorted(found)
+
+
+def _median_ms(args, repeat):
+    return statistics.median(_run(args)[0] for _ in range(repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cli.py 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=10, help="명령별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("CLI_STARTUP_BUDGET_MS", 300)),
+                        help="명령별 허용 시간 (ms, 기본 300 또는 CLI_STARTUP_BUDGET_MS)")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"=== ⏱️ CLI 시작 시간 벤치마크 (반복 {args.repeat}회, 예산 {args.budget_ms:.0f}ms) ===")
+
+    baseline = _median_ms(['-c', 'pass'], args.repeat)
+    print(f"{'python -c pass':<32} {baseline:8.1f} ms  (인터프리터 기본 비용)")
+
+    for cli_args in FAST_COMMANDS:
+        label = 'cli.py ' + ' '.join(cli_args)
+        elapsed = _median_ms(['cli.py', *cli_args], args.repeat)
+        heavy = _imported_heavy_modules(cli_args)
+
+        status = "OK"
+        if heavy:
+            status = "FAIL"
+            failures.append(f"{label}: 무거운 모듈 import ({', '.join(heavy)})")
+        if elapsed > args.budget_ms:
+            status = "FAIL"
+            failures.append(f"{label}: {elapsed:.1f}ms > 예산 {args.budget_ms:.0f}ms")
+        print(f"{label:<32} {elapsed:8.1f} ms  [{status}]")
+
+    print("\n[참고] 기존 스크립트 import 비용")
+    for module in REFERENCE_IMPORTS:
+        elapsed = _median_ms(['-c', f'import {module}'], max(1, args.repeat // 2))
+        print(f"{'import ' + module:<32} {elapsed:8.1f} ms")
+
+    if failures:
+        print("\n[FAIL] 시작 시간 회귀:")
+        for f in failures:
+            print(f"  - {f}")
+        return 1
+
+    print("\n[SUCCESS] 모든 빠른 경로가 예산 내에서 동작합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
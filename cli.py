@@ -0,0 +1,135 @@
+# cli.py
+"""
+ETF 데이터 파이프라인 단일 실행 진입점
+
+    python cli.py daily                         # 일간 KRX 시세
+    python cli.py weekly                        # 주간 상세 분석
+    python cli.py dividends                     # 배당 수집 및 분석
+    python cli.py backfill --start 20250101     # 기간 KRX 시세 백필
+    python cli.py replay weekly-20251206-090000-4821 # 보관된 실행 재처리 (run_id 접두어로 작업 판별)
+    python cli.py sync | migrate | health
+
+pandas, SQLAlchemy, tqdm 등 무거운 모듈은 각 서브커맨드 함수 안에서만 import 합니다.
+(--help, health는 표준 라이브러리와 config만 로드하므로 크론/컨테이너 헬스체크가 빠릅니다)
+"""
+import argparse
+import os
+import sys
+from datetime import date, datetime
+
+# replay: run_id 접두어(archive.new_run_id의 job) -> 서브커맨드
+REPLAY_JOBS = ('daily', 'weekly', 'dividends', 'backfill')
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+def _cmd_daily(args):
+    import run_daily_krx
+    run_daily_krx.run()
+
+
+def _cmd_weekly(args):
+    import run_weekly_analysis
+    run_weekly_analysis.run()
+
+
+def _cmd_dividends(args):
+    import run_dividend_scraper
+    run_dividend_scraper.run()
+
+
+def _cmd_backfill(args):
+    end = args.end or date.today()
+    if args.start > end:
+        print(f"[FATAL] 시작일({args.start})이 종료일({end})보다 늦습니다.")
+        return 1
+    import run_daily_krx
+    run_daily_krx.backfill(args.start, end)
+
+
+def _cmd_replay(args):
+    job = args.run_id.split('-', 1)[0]
+    if job not in REPLAY_JOBS:
+        print(f"[FATAL] run_id에서 작업을 알 수 없습니다: {args.run_id} (지원: {', '.join(REPLAY_JOBS)})")
+        return 1
+
+    if job == 'daily':
+        import run_daily_krx
+        run_daily_krx.run(replay_run_id=args.run_id)
+    elif job == 'weekly':
+        import run_weekly_analysis
+        run_weekly_analysis.run(replay_run_id=args.run_id)
+    elif job == 'dividends':
+        import run_dividend_scraper
+        run_dividend_scraper.run(replay_run_id=args.run_id)
+    else:
+        import run_daily_krx
+        run_daily_krx.backfill(replay_run_id=args.run_id)
+
+
+def _cmd_sync(args):
+    import run_sync_postgres
+    run_sync_postgres.run()
+
+
+def _cmd_migrate(args):
+    import run_db_migrations
+    run_db_migrations.run()
+
+
+def _cmd_health(args):
+    """설정값만 확인합니다. (DB/네트워크 접속 없음)"""
+    import config
+
+    backend = os.getenv("DB_BACKEND", "postgres").strip().lower()
+    problems = []
+    if not config.KRX_API_KEY:
+        problems.append("KRX_API_KEY 미설정")
+    if backend == "postgres" and not os.getenv("DB_HOST"):
+        problems.append("DB_HOST 미설정 (DB_BACKEND=postgres)")
+    elif backend not in ("postgres", "sqlite", "duckdb"):
+        problems.append(f"지원하지 않는 DB_BACKEND: {backend}")
+
+    if problems:
+        print(f"[HEALTH] FAIL: {', '.join(problems)}")
+        return 1
+    print(f"[HEALTH] OK (DB_BACKEND={backend})")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="ETF 데이터 파이프라인")
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    sub.add_parser("daily", help="일간 KRX ETF 시세 수집/적재").set_defaults(func=_cmd_daily)
+    sub.add_parser("weekly", help="주간 ETF 상세 분석 수집/적재").set_defaults(func=_cmd_weekly)
+    sub.add_parser("dividends", help="주간 ETF 배당금 수집 및 분석").set_defaults(func=_cmd_dividends)
+
+    p = sub.add_parser("backfill", help="기간 KRX 일간 시세 백필 (기준일별 교체 적재)")
+    p.add_argument("--start", type=_parse_date, required=True, metavar="YYYYMMDD", help="시작일")
+    p.add_argument("--end", type=_parse_date, metavar="YYYYMMDD", help="종료일 (기본: 오늘)")
+    p.set_defaults(func=_cmd_backfill)
+
+    p = sub.add_parser("replay", help="보관된 실행(run)의 원본 응답으로 재처리 (네트워크 없음)")
+    p.add_argument("run_id", help="예: weekly-20251206-090000-4821")
+    p.set_defaults(func=_cmd_replay)
+
+    sub.add_parser("sync", help="로컬 DB → Cloud SQL 동기화").set_defaults(func=_cmd_sync)
+    sub.add_parser("migrate", help="Cloud SQL 스키마 마이그레이션").set_defaults(func=_cmd_migrate)
+    sub.add_parser("health", help="설정 점검 (DB/네트워크 접속 없음)").set_defaults(func=_cmd_health)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # 설정(.env)은 여기서 한 번만 로드 (이후 import되는 모듈은 로드된 환경 변수를 사용)
+    import config
+    config.load_env()
+
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,26 @@
 """
 
 import os
-from dotenv import load_dotenv # 👈 라이브러리 추가
+
+_ENV_LOADED = False
+
+
+def load_env():
+    """
+    프로젝트 최상위의 .env 파일을 환경 변수로 로드합니다. (프로세스당 한 번만 수행)
+    DB 접속 정보 등 os.getenv로 읽는 설정은 이 함수 호출 이후에 읽어야 합니다.
+    """
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+    _ENV_LOADED = True
+
 
 # 🚨 해결책: config 모듈이 로드되는 시점에 .env 파일을 프로젝트 최상위에서 로드합니다.
 # 이 코드가 모든 모듈 로드보다 먼저 실행되어야 합니다.
-load_dotenv() 
+load_env()
 
 # 🚨 보안 수정: API 키는 Git에 올리면 안 되므로, 환경 변수에서 불러옵니다.
 KRX_API_KEY = os.environ.get("KRX_API_KEY", "") 
@@ -22,6 +37,10 @@ NAVER_ETF_ANALYSIS_URL = "https://m.stock.naver.com/api/stock/{code}/etfAnalysis
 # ETF 배당금 조회 URL
 NAVER_ETF_DIVIDEND_URL = "https://m.stock.naver.com/api/etf/{code}/dividend/history"
 
+# 네이버(m.stock.naver.com) 요청 한도: 같은 호스트에서 동시에 실행되는 모든 작업의 합산 기준 (src/ratelimit.py)
+NAVER_RATE_LIMIT = float(os.environ.get("NAVER_RATE_LIMIT", "5"))   # 초당 요청 수
+NAVER_RATE_BURST = float(os.environ.get("NAVER_RATE_BURST", "5"))   # 순간 허용 요청 수
+
 # 명세서에 나온 정확한 Endpoint URL
 KRX_ETF_DAILY_URL = "https://data-dbg.krx.co.kr/svc/apis/etp/etf_bydd_trd" 
 
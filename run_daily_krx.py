@@ -1,22 +1,28 @@
 # run_daily_krx.py
 import os
-import pandas as pd
+import argparse
 from datetime import datetime
-from src import loader, db 
-from dotenv import load_dotenv
+from src import loader, db, archive
 
-load_dotenv()
-
-def run():
+def run(replay_run_id=None):
     print("=== 일간 KRX ETF 데이터 수집기 시작 ===")
     
     # 1. 폴더 생성
     output_dir = "data/krx_daily"
     os.makedirs(output_dir, exist_ok=True)
     
-    # 2. KRX API 로드
+    # 2. KRX API 로드 (재처리 모드면 아카이브에서 로드)
     try:
-        krx_daily_df = loader.load_latest_krx_data()
+        if replay_run_id:
+            with archive.ArchiveReader(replay_run_id) as reader:
+                run_date = reader.std_date
+                krx_daily_df = loader.load_krx_data_from_archive(reader)
+        else:
+            run_date = datetime.now().date()
+            run_id = archive.new_run_id('daily')
+            with archive.ArchiveWriter(run_id, 'daily', run_date) as writer:
+                krx_daily_df = loader.load_latest_krx_data(archive=writer)
+            print(f"[ARCHIVE] 원본 응답 보관 완료: {run_id}")
     except Exception as e:
         print(f"[FATAL] 데이터 로드 실패: {e}")
         return
@@ -25,15 +31,51 @@ def run():
         print("[WARN] 가져온 데이터가 없습니다.")
         return
 
-    # 3. CSV 저장 (백업용)
-    today = datetime.now().strftime("%Y%m%d")
+    # 3. CSV 저장 (백업용, 재처리 시 원래 실행일 파일을 덮어씀)
+    today = run_date.strftime("%Y%m%d")
     output_path = os.path.join(output_dir, f"krx_data_{today}.csv")
-    krx_daily_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    krx_daily_df.to_csv(output_path, index=False, encoding="utf-8-sig", date_format="%Y%m%d")
     print(f"[SAVE] CSV 저장 완료: {output_path}")
 
     # 4. DB 적재
     print("\n[DB] Cloud SQL 적재 시작...")
-    
+    final_df = _to_db_frame(krx_daily_df)
+
+    # DB Insert (재처리 시 해당 기준일 행을 교체)
+    if replay_run_id:
+        _replace_by_date(final_df)
+    else:
+        db.upsert_dataframe(final_df, 'etf_daily_price')
+
+def backfill(start_date=None, end_date=None, replay_run_id=None):
+    """
+    기간(start_date ~ end_date) KRX 일간 시세를 기준일별로 교체 적재합니다. (CSV 백업 없음, 원본은 아카이브에 보관)
+    replay_run_id가 있으면 보관된 백필 실행을 네트워크 없이 재처리합니다.
+    """
+    print("=== ⏪ KRX ETF 일간 시세 백필 시작 ===")
+
+    try:
+        if replay_run_id:
+            with archive.ArchiveReader(replay_run_id) as reader:
+                krx_df = loader.load_krx_data_from_archive(reader, all_dates=True)
+        else:
+            print(f"[INFO] 백필 기간: {start_date} ~ {end_date}")
+            run_id = archive.new_run_id('backfill')
+            with archive.ArchiveWriter(run_id, 'backfill', end_date) as writer:
+                krx_df = loader.load_krx_data_range(start_date, end_date, archive=writer)
+            print(f"[ARCHIVE] 원본 응답 보관 완료: {run_id}")
+    except Exception as e:
+        print(f"[FATAL] 데이터 로드 실패: {e}")
+        return
+
+    if krx_df.empty:
+        print("[WARN] 가져온 데이터가 없습니다.")
+        return
+
+    _replace_by_date(_to_db_frame(krx_df))
+
+def _to_db_frame(krx_daily_df):
+    """KRX DataFrame -> etf_daily_price 적재용 DataFrame"""
     # DB 컬럼명으로 매핑
     rename_map = {
         '기준일자': 'std_date',
@@ -46,15 +88,19 @@ def run():
     }
     db_df = krx_daily_df.rename(columns=rename_map)
 
-    # 날짜 포맷 변환 (YYYYMMDD -> YYYY-MM-DD)
-    db_df['std_date'] = pd.to_datetime(db_df['std_date'].astype(str), format='%Y%m%d')
+    # 날짜는 loader 단계(schema)에서 이미 datetime으로 변환됨
 
     # 필요한 컬럼만 필터링
-    valid_cols = ['std_date', 'ticker', 'name', 'close_price', 'nav', 'market_cap', 'index_name']
-    final_df = db_df[[c for c in valid_cols if c in db_df.columns]].copy()
+    valid_cols = db.column_names('etf_daily_price')
+    return db_df[[c for c in valid_cols if c in db_df.columns]].copy()
 
-    # DB Insert
-    db.insert_dataframe(final_df, 'etf_daily_price')
+def _replace_by_date(final_df):
+    """기준일별로 기존 행을 삭제하고 교체 (재처리/백필)"""
+    for std_date in final_df['std_date'].dt.date.unique():
+        db.replace_date_rows(final_df[final_df['std_date'].dt.date == std_date], 'etf_daily_price', std_date)
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="일간 KRX ETF 시세 수집/적재")
+    parser.add_argument("--replay", metavar="RUN_ID", help="보관된 실행(run)의 원본 응답으로 재처리 (네트워크 없음)")
+    args = parser.parse_args()
+    run(replay_run_id=args.replay)
\ No newline at end of file
@@ -0,0 +1,14 @@
+# run_db_migrations.py
+from src import migrations
+
+def run():
+    print("=== 🗄️ Cloud SQL 스키마 마이그레이션 시작 ===")
+    try:
+        migrations.migrate()
+    except Exception as e:
+        print(f"[FATAL] 마이그레이션 실패: {e}")
+        return
+    print("[SUCCESS] 마이그레이션 완료.")
+
+if __name__ == "__main__":
+    run()
@@ -1,43 +1,85 @@
 # run_dividend_scraper.py
 import os
-import time
+import argparse
 import pandas as pd
 from datetime import datetime
 from tqdm import tqdm  # 🚀 진행률 표시용 라이브러리
-from src import loader, dividend_scraper, analyzer, db
+from src import loader, dividend_scraper, analyzer, db, archive, ratelimit
 
-def run():
-    print("=== 💰 주간 ETF 배당금 수집 및 분석기 시작 ===")
-    
-    # 1. 대상 종목 로드 (KRX 데이터 기준)
-    try:
-        krx_df = loader.load_latest_krx_data()
-        tickers = krx_df["단축코드"].tolist()
-        print(f"[INFO] 수집 대상: 총 {len(tickers)}개 종목")
-    except Exception as e:
-        print(f"[FATAL] 데이터 로드 실패: {e}")
-        return
+def _attach_name(df, krx_df, code):
+    """종목명 찾아서 넣기"""
+    name_row = krx_df.loc[krx_df['단축코드'] == code, '한글종목명']
+    name = name_row.values[0] if not name_row.empty else ""
+    df['종목명'] = name
+    return df
 
+def _scrape(krx_df, tickers, writer):
     all_dividends = []
-    
-    # 2. 배당금 수집 루프 (tqdm 적용)
+
+    # 요청 한도 설정 오류(NAVER_RATE_LIMIT 등)는 종목별 예외 처리에 묻히지 않도록 루프 전에 확인
+    ratelimit.naver_bucket()
     # desc: 진행바 제목, unit: 단위
     for code in tqdm(tickers, desc="배당 수집 중", unit="종목"):
         try:
-            # 최근 배당 내역 조회 (페이지 1)
-            df = dividend_scraper.get_etf_dividend_history(code, page=1)
+            # 최근 배당 내역 조회 (페이지 1, 요청 간격은 호스트 공용 토큰 버킷이 조절)
+            df = dividend_scraper.get_etf_dividend_history(code, page=1, archive=writer)
             
             if not df.empty:
-                # 종목명 찾아서 넣기
-                name_row = krx_df.loc[krx_df['단축코드'] == code, '한글종목명']
-                name = name_row.values[0] if not name_row.empty else ""
-                df['종목명'] = name
-                all_dividends.append(df)
+                all_dividends.append(_attach_name(df, krx_df, code))
         except Exception:
             # 에러 발생 시 건너뜀 (로그 생략하여 진행바 깨짐 방지)
             continue
-            
-        time.sleep(0.1) # 서버 부하 조절
+
+    return all_dividends
+
+def _replay(krx_df, reader):
+    all_dividends = []
+
+    for code in tqdm(reader.tickers('dividend'), desc="배당 재처리 중", unit="종목"):
+        df = dividend_scraper.parse_dividend_history(reader.get('dividend', code), code)
+        if not df.empty:
+            all_dividends.append(_attach_name(df, krx_df, code))
+
+    return all_dividends
+
+def run(replay_run_id=None):
+    print("=== 💰 주간 ETF 배당금 수집 및 분석기 시작 ===")
+
+    reader, writer = None, None
+    if replay_run_id:
+        try:
+            reader = archive.ArchiveReader(replay_run_id)
+        except FileNotFoundError as e:
+            print(f"[FATAL] {e}")
+            return
+        std_date = reader.std_date
+        print(f"[REPLAY] {replay_run_id} (기준일 {std_date}) 재처리 시작")
+    else:
+        std_date = datetime.now().date()
+        run_id = archive.new_run_id('dividends')
+        writer = archive.ArchiveWriter(run_id, 'dividends', std_date)
+
+    # 1. 대상 종목 로드 (KRX 데이터 기준)
+    try:
+        if reader is not None:
+            krx_df = loader.load_krx_data_from_archive(reader)
+        else:
+            krx_df = loader.load_latest_krx_data(archive=writer)
+        tickers = krx_df["단축코드"].tolist()
+        print(f"[INFO] 수집 대상: 총 {len(tickers)}개 종목")
+    except Exception as e:
+        print(f"[FATAL] 데이터 로드 실패: {e}")
+        (reader or writer).close()
+        return
+
+    # 2. 배당금 수집 루프 (tqdm 적용) / 재처리 시 아카이브에서 파싱
+    if reader is not None:
+        with reader:
+            all_dividends = _replay(krx_df, reader)
+    else:
+        with writer:
+            all_dividends = _scrape(krx_df, tickers, writer)
+        print(f"[ARCHIVE] 원본 응답 보관 완료: {run_id}")
 
     # 3. 데이터 유무 확인
     if not all_dividends:
@@ -70,26 +112,37 @@ def run():
 
     # 중복 제외 로직 및 저장
     try:
-        engine = db.get_engine()
-        # 기존 DB 키(ticker + ex_date) 가져오기
-        existing = pd.read_sql("SELECT ticker, ex_date FROM etf_dividends", engine)
-        existing_keys = set(zip(existing['ticker'], existing['ex_date'].astype(str)))
-        
-        # 수집 데이터 키 생성
-        hist_df['key_check'] = list(zip(hist_df['ticker'], hist_df['ex_date'].astype(str)))
-        
-        # DB에 없는 것만 남김
-        new_hist = hist_df[~hist_df['key_check'].isin(existing_keys)].drop(columns=['key_check'])
-        
-        # 유효 컬럼만 선택
         valid_cols = ['ticker', 'name', 'ex_date', 'amount']
-        final_hist = new_hist[[c for c in valid_cols if c in new_hist.columns]]
 
-        if not final_hist.empty:
-            db.insert_dataframe(final_hist, 'etf_dividends')
-            print(f"   -> 신규 이력 {len(final_hist)}건 저장 완료.")
+        if replay_run_id:
+            # 재처리: 보관된 응답의 이력 전체를 upsert (이미 있는 키도 보관 당시 값으로 덮어씀)
+            final_hist = hist_df[[c for c in valid_cols if c in hist_df.columns]]
+            final_hist = final_hist.dropna(subset=['ex_date']).drop_duplicates(subset=['ticker', 'ex_date'], keep='last')
+            if not final_hist.empty:
+                db.upsert_dataframe(final_hist, 'etf_dividends')
+                print(f"   -> [REPLAY] 이력 {len(final_hist)}건 upsert 완료.")
+            else:
+                print("   -> [REPLAY] 재처리할 이력 없음.")
         else:
-            print("   -> 신규 이력 없음 (모두 이미 DB에 존재).")
+            engine = db.get_engine()
+            # 기존 DB 키(ticker + ex_date) 가져오기
+            existing = pd.read_sql("SELECT ticker, ex_date FROM etf_dividends", engine)
+            existing_keys = set(zip(existing['ticker'], existing['ex_date'].astype(str)))
+
+            # 수집 데이터 키 생성
+            hist_df['key_check'] = list(zip(hist_df['ticker'], hist_df['ex_date'].astype(str)))
+
+            # DB에 없는 것만 남김
+            new_hist = hist_df[~hist_df['key_check'].isin(existing_keys)].drop(columns=['key_check'])
+
+            # 유효 컬럼만 선택
+            final_hist = new_hist[[c for c in valid_cols if c in new_hist.columns]]
+
+            if not final_hist.empty:
+                db.upsert_dataframe(final_hist, 'etf_dividends')
+                print(f"   -> 신규 이력 {len(final_hist)}건 저장 완료.")
+            else:
+                print("   -> 신규 이력 없음 (모두 이미 DB에 존재).")
             
     except Exception as e:
         print(f"   -> [ERROR] 이력 저장 중 오류: {e}")
@@ -103,7 +156,8 @@ def run():
     try:
         # 1. analyzer 모듈로 지표 계산
         analysis_df = analyzer.analyze_dividend_metrics(
-            raw_df[['종목코드', 'exDividendAt', 'dividendAmount']].copy()
+            raw_df[['종목코드', 'exDividendAt', 'dividendAmount']].copy(),
+            as_of=std_date
         )
         
         if not analysis_df.empty:
@@ -121,14 +175,17 @@ def run():
             }
             db_analysis_df = merged_analysis.rename(columns=analysis_rename_map)
 
-            # 3. 기준일(오늘) 추가
-            db_analysis_df['std_date'] = datetime.now().date()
+            # 3. 기준일(오늘, 재처리 시 원래 실행일) 추가
+            db_analysis_df['std_date'] = std_date
 
             # 4. DB 저장
             valid_analysis_cols = ['std_date', 'ticker', 'name', 'period', 'dividend_sum_1y', 'growth_rate_yoy']
             final_analysis = db_analysis_df[[c for c in valid_analysis_cols if c in db_analysis_df.columns]]
             
-            db.insert_dataframe(final_analysis, 'etf_dividend_analysis')
+            if replay_run_id:
+                db.replace_date_rows(final_analysis, 'etf_dividend_analysis', std_date)
+            else:
+                db.upsert_dataframe(final_analysis, 'etf_dividend_analysis')
             print(f"   -> 분석 결과 {len(final_analysis)}건 저장 완료.")
         else:
             print("   -> 분석할 데이터가 없습니다.")
@@ -137,4 +194,7 @@ def run():
         print(f"   -> [ERROR] 분석 저장 중 오류: {e}")
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="주간 ETF 배당금 수집 및 분석")
+    parser.add_argument("--replay", metavar="RUN_ID", help="보관된 실행(run)의 원본 응답으로 재처리 (네트워크 없음)")
+    args = parser.parse_args()
+    run(replay_run_id=args.replay)
\ No newline at end of file
@@ -0,0 +1,25 @@
+# run_sync_postgres.py
+import os
+from src import sync
+
+def run():
+    print("=== 🔄 로컬 DB → Cloud SQL 동기화 시작 ===")
+
+    # 로컬 백엔드: DB_BACKEND가 sqlite/duckdb이면 그대로, 아니면 sqlite
+    backend = os.getenv("DB_BACKEND", "sqlite")
+    local_backend = backend if backend in ("sqlite", "duckdb") else "sqlite"
+
+    try:
+        results = sync.sync_to_postgres(local_backend=local_backend)
+    except Exception as e:
+        print(f"[FATAL] 동기화 중단: {e}")
+        return
+
+    failed = [t for t, n in results.items() if n is None]
+    if failed:
+        print(f"[WARN] 동기화 실패 테이블: {failed}")
+    else:
+        print(f"[SUCCESS] 총 {sum(results.values())}건 동기화 완료.")
+
+if __name__ == "__main__":
+    run()
@@ -1,11 +1,11 @@
 # run_weekly_analysis.py
 import os
-import time
+import argparse
 import pandas as pd
 import glob
 from datetime import datetime
 from tqdm import tqdm
-from src import scraper, processor, db
+from src import scraper, processor, db, delta, overlap, schema, records, archive, ratelimit
 
 def _load_latest_krx_daily_snapshot():
     """최신 KRX 데이터 로드 (종목 리스트 확보용)"""
@@ -24,39 +24,100 @@ def _load_latest_krx_daily_snapshot():
     
     return df[['단축코드', '한글종목명']]
 
-def run():
-    print("=== 📊 주간 ETF 상세 분석 (분해 데이터 적재) ===")
-
-    # 1. 대상 종목 로드
-    try:
-        krx_daily_df = _load_latest_krx_daily_snapshot()
-        tickers = krx_daily_df["단축코드"].tolist()
-        print(f"[INFO] 수집 대상: 총 {len(tickers)}개 종목")
-    except Exception as e:
-        print(f"[FATAL] 데이터 로드 실패: {e}")
-        return
-
-    results = []
+def _scrape(tickers, writer):
+    """네이버 크롤링 (원본 응답은 writer에 보관)"""
+    basics, analyses = [], []
 
-    # 2. 네이버 크롤링
     print(f"[INFO] 네이버 데이터 수집 시작...")
+    # 요청 한도 설정 오류(NAVER_RATE_LIMIT 등)는 종목별 예외 처리에 묻히지 않도록 루프 전에 확인
+    ratelimit.naver_bucket()
     for code in tqdm(tickers, desc="Processing ETFs", unit="종목"):
         try:
-            time.sleep(0.3) # 서버 부하 방지
-            basic = scraper.fetch_etf_basic(code)
-            analysis = scraper.fetch_etf_analysis(code)
+            # 요청 간격은 scraper 내부의 호스트 공용 토큰 버킷(src/ratelimit.py)이 조절
+            basic = scraper.fetch_etf_basic(code, archive=writer)
+            analysis = scraper.fetch_etf_analysis(code, archive=writer)
 
             if not basic or not analysis:
                 continue
 
-            merged = {**basic, **analysis}
-            results.append(merged)
+            basics.append(basic)
+            analyses.append(analysis)
 
         except Exception as e:
             continue
 
-    if results:
-        df = pd.DataFrame(results)
+    return basics, analyses
+
+def _replay(reader):
+    """보관된 원본 응답을 같은 파서로 다시 처리 (네트워크 없음)"""
+    basics, analyses = [], []
+
+    for code in tqdm(reader.tickers('analysis'), desc="Replaying ETFs", unit="종목"):
+        basic_body = reader.get('basic', code)
+        analysis_body = reader.get('analysis', code)
+        if basic_body is None or analysis_body is None:
+            continue
+
+        try:
+            basic = scraper.parse_etf_basic(records.decode_payload(basic_body, 'basic'))
+            analysis = scraper.parse_etf_analysis(records.decode_payload(analysis_body, 'analysis'))
+        except Exception:
+            continue
+
+        if not basic or not analysis:
+            continue
+
+        basics.append(basic)
+        analyses.append(analysis)
+
+    return basics, analyses
+
+def _replace_versions(changed_df, table_name, std_date, total):
+    """재처리: 기준일의 버전 행을 변경분으로 교체 (변경분이 없으면 해당 기준일 버전 행 삭제)"""
+    n_changed = changed_df['ticker'].nunique() if not changed_df.empty else 0
+    print(f"[REPLAY] {table_name}: {total}개 종목 중 직전 버전과 다른 {n_changed}개 종목만 {std_date} 버전으로 적재")
+    if changed_df.empty:
+        db.delete_date_rows(table_name, std_date)
+    else:
+        db.replace_date_rows(changed_df, table_name, std_date)
+
+def run(replay_run_id=None):
+    print("=== 📊 주간 ETF 상세 분석 (분해 데이터 적재) ===")
+
+    if replay_run_id:
+        # 0. 재처리 모드: 아카이브 → 파싱 → 전처리 → DB (네트워크 없음)
+        try:
+            reader = archive.ArchiveReader(replay_run_id)
+        except FileNotFoundError as e:
+            print(f"[FATAL] {e}")
+            return
+
+        std_date = reader.std_date
+        print(f"[REPLAY] {replay_run_id} (기준일 {std_date}) 재처리 시작")
+        with reader:
+            basics, analyses = _replay(reader)
+    else:
+        # 1. 대상 종목 로드
+        try:
+            krx_daily_df = _load_latest_krx_daily_snapshot()
+            tickers = krx_daily_df["단축코드"].tolist()
+            print(f"[INFO] 수집 대상: 총 {len(tickers)}개 종목")
+        except Exception as e:
+            print(f"[FATAL] 데이터 로드 실패: {e}")
+            return
+
+        # 2. 네이버 크롤링 (원본 응답 아카이브)
+        std_date = datetime.now().date()
+        run_id = archive.new_run_id('weekly')
+        with archive.ArchiveWriter(run_id, 'weekly', std_date) as writer:
+            basics, analyses = _scrape(tickers, writer)
+        print(f"[ARCHIVE] 원본 응답 보관 완료: {run_id}")
+
+    if basics:
+        # 구성 종목(Top 10) 리스트는 별도 테이블(etf_holdings)로 분리
+        holdings_df = overlap.build_holdings_frame(basics, analyses, std_date)
+        # 레코드 리스트 -> 컬럼 단위로 한 번에 DataFrame 변환
+        df = records.records_to_frame(basics, analyses)
 
         # -----------------------------------------------------------
         # [STEP 1] 기본 컬럼 매핑 (DB 컬럼명 기준)
@@ -90,12 +151,12 @@ def run():
         df = processor.preprocess_etf_data(df)
         
         # 기준일 추가
-        df['std_date'] = datetime.now().date()
+        df['std_date'] = std_date
 
         # -----------------------------------------------------------
         # [STEP 3] CSV 저장 (모든 데이터 포함)
         # -----------------------------------------------------------
-        today_str = datetime.now().strftime("%Y%m%d")
+        today_str = std_date.strftime("%Y%m%d")
         os.makedirs("data/output", exist_ok=True)
         csv_path = f"data/output/etf_weekly_analysis_report_{today_str}.csv"
         
@@ -125,14 +186,63 @@ def run():
         # 4. 데이터프레임 필터링 (DB에 있는 컬럼만 남기고 나머지는 버림)
         final_db_df = df[[c for c in valid_db_cols if c in df.columns]].copy()
         
-        # 날짜 타입 보정
-        if 'listed_date' in final_db_df.columns:
-            final_db_df['listed_date'] = pd.to_datetime(final_db_df['listed_date'], errors='coerce')
-
-        db.insert_dataframe(final_db_df, 'etf_analysis')
+        # 타입 보정 및 검증 (날짜, 수치, 범주형)
+        final_db_df = schema.apply_analysis_schema(final_db_df)
+
+        # 5. 테이블 분리: 매주 바뀌는 지표(etf_analysis) / 느리게 변하는 속성(etf_profile)
+        metrics_df = final_db_df[[c for c in db.column_names('etf_analysis') if c in final_db_df.columns]]
+        profile_df = final_db_df[[c for c in db.column_names('etf_profile') if c in final_db_df.columns]]
+
+        if replay_run_id:
+            # 재처리: 지표는 해당 기준일의 전체 스냅샷으로 교체하고,
+            # 속성/구성 종목은 기준일 시점에 유효한 직전 버전과 다른 종목만 그 기준일 버전으로 교체
+            # (변경 감지 인덱스 파일은 건드리지 않음)
+            db.replace_date_rows(metrics_df, 'etf_analysis', std_date)
+
+            changed_profile = delta.filter_changed_against(
+                profile_df, delta.load_previous_versions('etf_profile', std_date),
+                ignore_cols=delta.PROFILE_IGNORE_COLS, round_cols=delta.PROFILE_ROUND_COLS
+            )
+            _replace_versions(changed_profile, 'etf_profile', std_date, len(profile_df))
+
+            changed_sig = delta.filter_changed_against(
+                overlap.holdings_signature(holdings_df),
+                overlap.holdings_signature(delta.load_previous_versions('etf_holdings', std_date)),
+            )
+            changed_holdings = holdings_df[holdings_df['ticker'].isin(changed_sig['ticker'])]
+            _replace_versions(changed_holdings, 'etf_holdings', std_date, holdings_df['ticker'].nunique())
+            return
+
+        # 지표는 컬럼이 적은 주간 팩트로 전 종목 적재
+        db.upsert_dataframe(metrics_df, 'etf_analysis')
+
+        # 속성은 직전 버전과 해시가 다른 종목만 새 버전 행으로 적재
+        changed_profile, new_hash_index = delta.filter_changed_rows(
+            profile_df, 'etf_profile',
+            ignore_cols=delta.PROFILE_IGNORE_COLS, round_cols=delta.PROFILE_ROUND_COLS
+        )
+
+        if changed_profile.empty:
+            print("[DB] 속성이 바뀐 종목이 없어 etf_profile 적재를 생략합니다.")
+        elif db.upsert_dataframe(changed_profile, 'etf_profile'):
+            # DB 적재가 성공한 경우에만 해시 인덱스 갱신 (실패 시 다음 실행에서 재시도)
+            delta.save_hash_index('etf_profile', new_hash_index)
+
+        # 6. 구성 종목(Top 10 + 비중) 적재: 구성이 바뀐 종목만
+        holdings_sig = overlap.holdings_signature(holdings_df)
+        changed_sig, new_holdings_index = delta.filter_changed_rows(holdings_sig, 'etf_holdings')
+        changed_holdings = holdings_df[holdings_df['ticker'].isin(changed_sig['ticker'])]
+
+        if changed_holdings.empty:
+            print("[DB] 구성 종목 변경이 없어 적재를 생략합니다.")
+        elif db.upsert_dataframe(changed_holdings, 'etf_holdings'):
+            delta.save_hash_index('etf_holdings', new_holdings_index)
 
     else:
         print("[WARN] 수집된 데이터가 없습니다.")
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="주간 ETF 상세 분석 수집/적재")
+    parser.add_argument("--replay", metavar="RUN_ID", help="보관된 실행(run)의 원본 응답으로 재처리 (네트워크 없음)")
+    args = parser.parse_args()
+    run(replay_run_id=args.replay)
\ No newline at end of file
@@ -3,10 +3,12 @@ import pandas as pd
 from collections import Counter
 from datetime import datetime
 
-def analyze_dividend_metrics(df: pd.DataFrame) -> pd.DataFrame:
+def analyze_dividend_metrics(df: pd.DataFrame, as_of=None) -> pd.DataFrame:
     """
     배당 이력 DataFrame을 분석하여 배당 주기와 배당 성장률을 계산합니다.
+    as_of: 분석 기준 시점 (기본값: 현재, 아카이브 재처리 시 원래 실행일)
     """
+    as_of = pd.Timestamp(as_of) if as_of is not None else datetime.now()
     if df.empty:
         return pd.DataFrame()
     
@@ -21,11 +23,11 @@ def analyze_dividend_metrics(df: pd.DataFrame) -> pd.DataFrame:
     df['dividendAmount'] = pd.to_numeric(df['dividendAmount'], errors='coerce').fillna(0)
     
     # 2. 종목별 분석 실행
-    analysis_results = df.groupby('종목코드').apply(_calculate_metrics).reset_index()
+    analysis_results = df.groupby('종목코드').apply(_calculate_metrics, as_of).reset_index()
     
     return analysis_results
 
-def _calculate_metrics(group: pd.DataFrame) -> pd.Series:
+def _calculate_metrics(group: pd.DataFrame, as_of) -> pd.Series:
     """
     개별 ETF 그룹(종목코드 기준)에 대해 배당 주기와 성장률을 계산합니다.
     """
@@ -37,7 +39,7 @@ def _calculate_metrics(group: pd.DataFrame) -> pd.Series:
     # ------------------------------------
     
     # 최근 12개월간의 배당 횟수
-    one_year_ago = datetime.now() - pd.DateOffset(years=1)
+    one_year_ago = as_of - pd.DateOffset(years=1)
     recent_dividends = group[group['exDividendAt'] >= one_year_ago]
     
     frequency = len(recent_dividends)
@@ -67,7 +69,7 @@ def _calculate_metrics(group: pd.DataFrame) -> pd.Series:
         last_12_months = group[group['exDividendAt'] >= one_year_ago]['dividendAmount'].sum()
         
         # 2. 그 전 12개월 배당 총액 (24개월 전 ~ 12개월 전)
-        two_years_ago = datetime.now() - pd.DateOffset(years=2)
+        two_years_ago = as_of - pd.DateOffset(years=2)
         prior_12_months = group[(group['exDividendAt'] >= two_years_ago) & (group['exDividendAt'] < one_year_ago)]['dividendAmount'].sum()
 
         if prior_12_months > 0 and last_12_months > 0:
@@ -0,0 +1,162 @@
+# src/archive.py
+import os
+import csv
+import json
+import zlib
+from datetime import datetime
+
+# 실행(run)별 원본 응답 보관 위치: data/archive/<run_id>/
+ARCHIVE_ROOT = "data/archive"
+
+# 세그먼트 파일 최대 크기 (초과 시 다음 세그먼트로 넘어감)
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+INDEX_FIELDS = ['endpoint', 'ticker', 'date', 'segment', 'offset', 'length']
+
+
+def new_run_id(job: str) -> str:
+    """예: weekly-20251206-090000-4821 (같은 초에 시작한 실행끼리 겹치지 않도록 PID 접미어)"""
+    return f"{job}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+def _run_dir(run_id: str) -> str:
+    return os.path.join(ARCHIVE_ROOT, run_id)
+
+
+class ArchiveWriter:
+    """
+    원본 응답 본문을 zlib 압축하여 append-only 세그먼트 파일에 기록하고,
+    (endpoint, ticker, date) -> (segment, offset, length) 인덱스를 index.csv에 추가합니다.
+    """
+
+    def __init__(self, run_id: str, job: str, std_date=None):
+        self.run_id = run_id
+        self.dir = _run_dir(run_id)
+        # 다른 실행의 아카이브에 섞여 기록되지 않도록 이미 있으면 실패
+        os.makedirs(ARCHIVE_ROOT, exist_ok=True)
+        os.mkdir(self.dir)
+        self.std_date = str(std_date or datetime.now().date())
+
+        meta = {
+            'run_id': run_id,
+            'job': job,
+            'std_date': self.std_date,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with open(os.path.join(self.dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        index_path = os.path.join(self.dir, "index.csv")
+        is_new = not os.path.exists(index_path)
+        self._index_file = open(index_path, "a", newline="", encoding="utf-8")
+        self._index = csv.writer(self._index_file)
+        if is_new:
+            self._index.writerow(INDEX_FIELDS)
+
+        self._segment_no = 0
+        self._segment = None
+        self._open_segment()
+
+    def _open_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+        path = os.path.join(self.dir, f"seg_{self._segment_no:05d}.bin")
+        self._segment = open(path, "ab")
+
+    def append(self, endpoint: str, ticker: str, body: bytes, date: str = None):
+        """응답 본문 1건을 기록합니다. date를 생략하면 실행 기준일을 사용합니다."""
+        if body is None:
+            return
+        data = zlib.compress(body)
+
+        if self._segment.tell() + len(data) > SEGMENT_MAX_BYTES and self._segment.tell() > 0:
+            self._segment_no += 1
+            self._open_segment()
+
+        offset = self._segment.tell()
+        self._segment.write(data)
+        self._index.writerow([endpoint, ticker or "", date or self.std_date, self._segment_no, offset, len(data)])
+
+    def close(self):
+        self._segment.flush()
+        self._segment.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArchiveReader:
+    """ArchiveWriter로 기록한 실행(run)의 응답 본문을 인덱스로 조회합니다."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.dir = _run_dir(run_id)
+        if not os.path.isdir(self.dir):
+            raise FileNotFoundError(f"아카이브가 없습니다: {self.dir}")
+
+        with open(os.path.join(self.dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        # 같은 키가 여러 번 기록된 경우(재시도 등) 마지막 기록을 사용
+        self.entries = {}
+        self._latest = {}
+        with open(os.path.join(self.dir, "index.csv"), newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                loc = (int(row['segment']), int(row['offset']), int(row['length']))
+                self.entries[(row['endpoint'], row['ticker'], row['date'])] = loc
+                self._latest[(row['endpoint'], row['ticker'])] = loc
+
+        self._segments = {}
+
+    @property
+    def std_date(self):
+        return datetime.strptime(self.meta['std_date'], "%Y-%m-%d").date()
+
+    def _read(self, segment, offset, length) -> bytes:
+        f = self._segments.get(segment)
+        if f is None:
+            f = open(os.path.join(self.dir, f"seg_{segment:05d}.bin"), "rb")
+            self._segments[segment] = f
+        f.seek(offset)
+        return zlib.decompress(f.read(length))
+
+    def get(self, endpoint: str, ticker: str = "", date: str = None):
+        """본문(bytes)을 반환합니다. date를 생략하면 해당 종목의 마지막 기록. 없으면 None."""
+        if date is None:
+            loc = self._latest.get((endpoint, ticker or ""))
+        else:
+            loc = self.entries.get((endpoint, ticker or "", date))
+        return None if loc is None else self._read(*loc)
+
+    def iter_endpoint(self, endpoint: str):
+        """(ticker, date, body) 를 기록 순서대로 순회합니다."""
+        for (ep, ticker, date), loc in self.entries.items():
+            if ep == endpoint:
+                yield ticker, date, self._read(*loc)
+
+    def tickers(self, endpoint: str):
+        """해당 endpoint에 기록된 종목코드 목록 (기록 순서, 중복 제거)"""
+        return [t for (ep, t) in self._latest if ep == endpoint]
+
+    def close(self):
+        for f in self._segments.values():
+            f.close()
+        self._segments = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def list_runs(job: str = None):
+    """보관된 run_id 목록 (오래된 순)"""
+    if not os.path.isdir(ARCHIVE_ROOT):
+        return []
+    runs = sorted(d for d in os.listdir(ARCHIVE_ROOT) if os.path.isdir(os.path.join(ARCHIVE_ROOT, d)))
+    return [r for r in runs if job is None or r.startswith(f"{job}-")]
@@ -1,36 +1,344 @@
 # src/db.py
 import os
 import pandas as pd
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+from sqlalchemy import create_engine, inspect, text
+from config import load_env
 
-# 환경 변수 로드
-load_dotenv()
+# 환경 변수 로드 (config에서 이미 로드했다면 생략됨)
+load_env()
 
-def get_engine():
-    """SQLAlchemy Engine 객체 생성"""
+# 로컬 임베디드 DB 기본 경로 (DB_BACKEND=sqlite/duckdb 일 때 사용)
+DEFAULT_LOCAL_DB_PATH = "data/local/etf.db"
+
+# 테이블별 자연키 (upsert 충돌 기준)
+TABLE_KEYS = {
+    'etf_daily_price': ['std_date', 'ticker'],
+    'etf_analysis': ['std_date', 'ticker'],
+    'etf_profile': ['std_date', 'ticker'],
+    'etf_holdings': ['std_date', 'ticker', 'rank'],
+    'etf_dividends': ['ticker', 'ex_date'],
+    'etf_dividend_analysis': ['std_date', 'ticker'],
+}
+
+# 로컬 → Postgres 동기화 단위 날짜 컬럼 (동기화 순서 = 정의 순서)
+SYNC_DATE_COLS = {
+    'etf_daily_price': 'std_date',
+    'etf_analysis': 'std_date',
+    'etf_profile': 'std_date',
+    'etf_holdings': 'std_date',
+    'etf_dividends': 'ex_date',
+    'etf_dividend_analysis': 'std_date',
+}
+
+# 로컬 백엔드에서 적재/교체가 일어난 (테이블, 날짜) 기록 → 동기화 시 해당 날짜를 원격에서 통째로 교체
+# mark_count는 같은 날짜가 다시 기록될 때마다 증가 (동기화 중 재기록된 날짜는 전송 후에도 남겨 둠)
+SYNC_PENDING_TABLE = 'sync_pending'
+
+# 날짜 컬럼 (SQLite는 DATE 타입이 없어 문자열로 저장되므로 'YYYY-MM-DD' 형태로 통일)
+DATE_COLS = ['std_date', 'listed_date', 'ex_date']
+
+# 테이블 컬럼 정의 (docs/database_schema.md 기준, 로컬 백엔드와 Postgres 마이그레이션이 공유)
+TABLE_COLUMNS = {
+    'etf_daily_price': [
+        ('std_date', 'DATE NOT NULL'),
+        ('ticker', 'VARCHAR(10) NOT NULL'),
+        ('name', 'VARCHAR(100)'),
+        ('close_price', 'DOUBLE PRECISION'),
+        ('market_cap', 'BIGINT'),
+        ('index_name', 'VARCHAR(100)'),
+        ('created_at', 'TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP'),
+    ],
+    # 매주 전 종목을 적재하는 변동 지표 (narrow fact)
+    'etf_analysis': [
+        ('std_date', 'DATE NOT NULL'),
+        ('ticker', 'VARCHAR(10) NOT NULL'),
+        ('name', 'VARCHAR(100)'),
+        ('nav', 'DOUBLE PRECISION'),
+        ('price', 'DOUBLE PRECISION'),
+        ('market_cap', 'DOUBLE PRECISION'),
+        ('inflow_1m', 'DOUBLE PRECISION'),
+        ('distribution_yield', 'DOUBLE PRECISION'),
+        ('tracking_error', 'DOUBLE PRECISION'),
+        ('return_1m', 'DOUBLE PRECISION'),
+        ('return_6m', 'DOUBLE PRECISION'),
+        ('return_1y', 'DOUBLE PRECISION'),
+    ],
+    # 느리게 변하는 속성 (값이 바뀐 종목만 새 버전 행으로 적재, std_date = 버전 시작일)
+    'etf_profile': [
+        ('std_date', 'DATE NOT NULL'),
+        ('ticker', 'VARCHAR(10) NOT NULL'),
+        ('issuer', 'VARCHAR(50)'),
+        ('listed_date', 'DATE'),
+        ('fee', 'DOUBLE PRECISION'),
+        ('top_holdings', 'TEXT'),
+        ('sector_weight', 'TEXT'),
+        ('country_weight', 'TEXT'),
+    ] + [
+        col
+        for i in range(1, 4)
+        for col in [
+            (f'sector_{i}', 'VARCHAR(50)'), (f'sector_{i}_pct', 'DOUBLE PRECISION'),
+            (f'country_{i}', 'VARCHAR(50)'), (f'country_{i}_pct', 'DOUBLE PRECISION'),
+        ]
+    ],
+    'etf_holdings': [
+        ('std_date', 'DATE NOT NULL'),
+        ('ticker', 'VARCHAR(10) NOT NULL'),
+        ('rank', 'INTEGER NOT NULL'),
+        ('holding_code', 'VARCHAR(20)'),
+        ('holding_name', 'VARCHAR(100)'),
+        ('weight', 'DOUBLE PRECISION'),
+    ],
+    'etf_dividends': [
+        ('ticker', 'VARCHAR(10) NOT NULL'),
+        ('name', 'VARCHAR(100)'),
+        ('ex_date', 'DATE NOT NULL'),
+        ('amount', 'DOUBLE PRECISION'),
+    ],
+    'etf_dividend_analysis': [
+        ('std_date', 'DATE NOT NULL'),
+        ('ticker', 'VARCHAR(10) NOT NULL'),
+        ('name', 'VARCHAR(100)'),
+        ('period', 'VARCHAR(20)'),
+        ('dividend_sum_1y', 'DOUBLE PRECISION'),
+        ('growth_rate_yoy', 'DOUBLE PRECISION'),
+    ],
+}
+
+
+def column_names(table_name: str) -> list:
+    """TABLE_COLUMNS 기준 컬럼명 목록"""
+    return [col for col, _ in TABLE_COLUMNS[table_name]]
+
+
+def create_table_sql(table_name: str, suffix: str = "", name: str = None) -> str:
+    """TABLE_COLUMNS / TABLE_KEYS 기준 CREATE TABLE 문 (suffix: 예) PARTITION BY RANGE (std_date))"""
+    cols = [f"    {col} {col_type}" for col, col_type in TABLE_COLUMNS[table_name]]
+    cols.append(f"    PRIMARY KEY ({', '.join(TABLE_KEYS[table_name])})")
+    body = ",\n".join(cols)
+    return f"CREATE TABLE IF NOT EXISTS {name or table_name} (\n{body}\n){suffix}"
+
+
+def get_backend():
+    """사용할 저장소 백엔드 (postgres | sqlite | duckdb). 기본값은 postgres."""
+    return os.getenv("DB_BACKEND", "postgres").strip().lower()
+
+
+def _postgres_url():
     user = os.getenv("DB_USER")
     password = os.getenv("DB_PASSWORD")
     host = os.getenv("DB_HOST")
     port = os.getenv("DB_PORT", "5432")
     db_name = os.getenv("DB_NAME", "postgres")
-    
-    # PostgreSQL 연결 URL
-    url = f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
-    return create_engine(url)
 
-def insert_dataframe(df: pd.DataFrame, table_name: str, if_exists='append'):
+    # PostgreSQL 연결 URL (requirements의 psycopg2 드라이버를 명시)
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}"
+
+
+def get_engine(backend=None):
+    """
+    SQLAlchemy Engine 객체 생성
+    - postgres: Cloud SQL (DB_HOST 등 환경 변수)
+    - sqlite / duckdb: 로컬 임베디드 DB (LOCAL_DB_PATH, 기본 data/local/etf.db). 네트워크 불필요
+    """
+    backend = backend or get_backend()
+
+    if backend == "postgres":
+        return create_engine(_postgres_url())
+
+    if backend not in ("sqlite", "duckdb"):
+        raise ValueError(f"지원하지 않는 DB_BACKEND입니다: {backend}")
+
+    path = os.getenv("LOCAL_DB_PATH", DEFAULT_LOCAL_DB_PATH)
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # duckdb는 duckdb-engine 패키지가 설치되어 있어야 함 (컬럼형 분석 쿼리용)
+    engine = create_engine(f"{backend}:///{path}")
+    init_local_schema(engine)
+    return engine
+
+
+def init_local_schema(engine):
+    """로컬 백엔드에 테이블이 없으면 생성합니다. (자연키 PK 포함)"""
+    with engine.begin() as conn:
+        for table_name in TABLE_COLUMNS:
+            conn.execute(text(create_table_sql(table_name)))
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SYNC_PENDING_TABLE} (\n"
+            "    table_name VARCHAR(50) NOT NULL,\n"
+            "    sync_date DATE NOT NULL,\n"
+            "    mark_count INTEGER NOT NULL DEFAULT 1,\n"
+            "    PRIMARY KEY (table_name, sync_date)\n"
+            ")"
+        ))
+        # mark_count 도입 전에 만든 로컬 DB
+        if 'mark_count' not in conn.execute(text(f"SELECT * FROM {SYNC_PENDING_TABLE} LIMIT 0")).keys():
+            conn.execute(text(f"ALTER TABLE {SYNC_PENDING_TABLE} ADD COLUMN mark_count INTEGER DEFAULT 1"))
+
+
+def _prepare_for_backend(df: pd.DataFrame, engine) -> pd.DataFrame:
+    """백엔드별 타입 차이를 보정합니다."""
+    if engine.dialect.name != "sqlite":
+        return df
+
+    df = df.copy()
+    for col in DATE_COLS:
+        if col in df.columns and pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.date
+    return df
+
+
+def _ensure_partitions(df: pd.DataFrame, table_name: str, engine):
+    """Postgres 월 파티션 테이블이면 적재 대상 기준일의 파티션을 미리 생성합니다."""
+    if engine.dialect.name != "postgresql" or 'std_date' not in df.columns:
+        return
+    from src import migrations
+    dates = pd.to_datetime(df['std_date']).dt.date.unique()
+    migrations.ensure_partitions_for_dates(engine, table_name, dates)
+
+
+def mark_sync_pending(conn, table_name: str, dates):
+    """sync_pending에 (table_name, 날짜)를 기록합니다. 이미 있으면 mark_count만 증가"""
+    for d in sorted({pd.to_datetime(d).date() for d in dates}):
+        conn.execute(text(
+            f"INSERT INTO {SYNC_PENDING_TABLE} (table_name, sync_date, mark_count) VALUES (:t, :d, 1) "
+            f"ON CONFLICT (table_name, sync_date) DO UPDATE SET mark_count = {SYNC_PENDING_TABLE}.mark_count + 1"
+        ), {'t': table_name, 'd': str(d)})
+
+
+def _mark_sync_pending(conn, df: pd.DataFrame, table_name: str, extra_dates=()):
+    """로컬 백엔드 적재와 같은 트랜잭션에서 변경된 날짜를 sync_pending에 기록합니다. (Postgres 적재는 기록 안 함)"""
+    date_col = SYNC_DATE_COLS.get(table_name)
+    if conn.dialect.name not in ("sqlite", "duckdb") or date_col is None:
+        return
+
+    dates = list(extra_dates)
+    if date_col in df.columns:
+        dates.extend(pd.to_datetime(df[date_col], errors='coerce').dropna().dt.date)
+    mark_sync_pending(conn, table_name, dates)
+
+
+def insert_dataframe(df: pd.DataFrame, table_name: str, if_exists='append', engine=None):
     """
     DataFrame을 DB 테이블에 저장합니다.
+    저장 성공 여부(bool)를 반환합니다.
     """
     if df.empty:
         print(f"[DB WARN] {table_name}에 저장할 데이터가 없습니다.")
-        return
+        return False
 
-    engine = get_engine()
+    engine = engine or get_engine()
+    df = _prepare_for_backend(df, engine)
     try:
-        # index=False: 인덱스는 DB에 넣지 않음
-        df.to_sql(name=table_name, con=engine, if_exists=if_exists, index=False)
+        _ensure_partitions(df, table_name, engine)
+        with engine.begin() as conn:
+            # index=False: 인덱스는 DB에 넣지 않음
+            df.to_sql(name=table_name, con=conn, if_exists=if_exists, index=False)
+            _mark_sync_pending(conn, df, table_name)
         print(f"[DB SUCCESS] {table_name} 테이블에 {len(df)}건 저장 완료.")
+        return True
+    except Exception as e:
+        print(f"[DB ERROR] {table_name} 저장 실패: {e}")
+        return False
+
+
+def _upsert_method(key_cols):
+    """to_sql(method=...)용: INSERT ... ON CONFLICT (키) DO UPDATE 로 일괄 upsert"""
+    def method(table, conn, keys, data_iter):
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            # duckdb 등: PostgreSQL 호환 ON CONFLICT 구문 사용
+            from sqlalchemy.dialects.postgresql import insert
+
+        rows = [dict(zip(keys, row)) for row in data_iter]
+        stmt = insert(table.table).values(rows)
+        update_cols = {c: stmt.excluded[c] for c in keys if c not in key_cols}
+        if update_cols:
+            stmt = stmt.on_conflict_do_update(index_elements=key_cols, set_=update_cols)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=key_cols)
+        result = conn.execute(stmt)
+        return result.rowcount
+
+    return method
+
+
+def upsert_dataframe(df: pd.DataFrame, table_name: str, key_cols=None, engine=None, chunksize=1000):
+    """
+    DataFrame을 자연키(TABLE_KEYS) 기준으로 일괄 upsert 합니다.
+    (대상 테이블에 해당 키의 PK/UNIQUE 제약이 있어야 함)
+    저장 성공 여부(bool)를 반환합니다.
+    """
+    if df.empty:
+        print(f"[DB WARN] {table_name}에 저장할 데이터가 없습니다.")
+        return False
+
+    key_cols = key_cols or TABLE_KEYS[table_name]
+    engine = engine or get_engine()
+    df = _prepare_for_backend(df, engine)
+    try:
+        _ensure_partitions(df, table_name, engine)
+        with engine.begin() as conn:
+            df.to_sql(name=table_name, con=conn, if_exists='append', index=False,
+                      chunksize=chunksize, method=_upsert_method(key_cols))
+            _mark_sync_pending(conn, df, table_name)
+        print(f"[DB SUCCESS] {table_name} 테이블에 {len(df)}건 upsert 완료.")
+        return True
+    except Exception as e:
+        print(f"[DB ERROR] {table_name} upsert 실패: {e}")
+        return False
+
+
+def replace_date_rows(df: pd.DataFrame, table_name: str, std_date, date_col='std_date', engine=None):
+    """
+    기준일(date_col = std_date)의 기존 행을 삭제하고 df로 교체합니다. (한 트랜잭션, 재처리용)
+    저장 성공 여부(bool)를 반환합니다.
+    """
+    if df.empty:
+        print(f"[DB WARN] {table_name}에 저장할 데이터가 없습니다.")
+        return False
+
+    engine = engine or get_engine()
+    df = _prepare_for_backend(df, engine)
+    try:
+        _ensure_partitions(df, table_name, engine)
+        with engine.begin() as conn:
+            deleted = 0
+            if inspect(conn).has_table(table_name):
+                result = conn.execute(text(f"DELETE FROM {table_name} WHERE {date_col} = :d"), {'d': std_date})
+                deleted = result.rowcount
+            df.to_sql(name=table_name, con=conn, if_exists='append', index=False)
+            # 삭제만 되고 df에 없는 기준일도 원격에서 교체되도록 함께 기록
+            replaced = [std_date] if date_col == SYNC_DATE_COLS.get(table_name) else []
+            _mark_sync_pending(conn, df, table_name, extra_dates=replaced)
+        print(f"[DB SUCCESS] {table_name} 테이블 {std_date} 기준 {deleted}건 삭제 후 {len(df)}건 저장 완료.")
+        return True
+    except Exception as e:
+        print(f"[DB ERROR] {table_name} 교체 실패: {e}")
+        return False
+
+
+def delete_date_rows(table_name: str, std_date, date_col='std_date', engine=None):
+    """
+    기준일(date_col = std_date)의 행을 삭제합니다. (재처리 결과 해당 기준일에 남길 행이 없는 경우)
+    삭제 성공 여부(bool)를 반환합니다.
+    """
+    engine = engine or get_engine()
+    try:
+        with engine.begin() as conn:
+            deleted = 0
+            if inspect(conn).has_table(table_name):
+                result = conn.execute(text(f"DELETE FROM {table_name} WHERE {date_col} = :d"), {'d': std_date})
+                deleted = result.rowcount
+            if date_col == SYNC_DATE_COLS.get(table_name):
+                _mark_sync_pending(conn, pd.DataFrame(), table_name, extra_dates=[std_date])
+        print(f"[DB SUCCESS] {table_name} 테이블 {std_date} 기준 {deleted}건 삭제 완료.")
+        return True
     except Exception as e:
-        print(f"[DB ERROR] {table_name} 저장 실패: {e}")
\ No newline at end of file
+        print(f"[DB ERROR] {table_name} 삭제 실패: {e}")
+        return False
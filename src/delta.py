@@ -0,0 +1,140 @@
+# src/delta.py
+import os
+import hashlib
+import pandas as pd
+
+# 직전 스냅샷의 행 해시를 보관하는 로컬 인덱스 경로
+HASH_INDEX_DIR = "data/state"
+
+# 해시 계산에서 제외할 컬럼 (매주 값이 바뀌는 기준일 자체는 변경으로 보지 않음)
+DEFAULT_IGNORE_COLS = ['std_date']
+
+# etf_profile(느리게 변하는 속성) 해시 설정
+# - 비중 원문 텍스트(sector_weight, country_weight)는 상위 3개 분해 컬럼과 같은 정보이므로 제외
+# - 비중(%)은 매주 소수점 단위로 흔들리므로 1%p 단위로 반올림해 비교 (구성 변화만 새 버전으로)
+PROFILE_IGNORE_COLS = ['std_date', 'sector_weight', 'country_weight']
+PROFILE_ROUND_COLS = {f'{p}_{i}_pct': 0 for p in ('sector', 'country') for i in range(1, 4)}
+
+
+# 버전 테이블(etf_profile, etf_holdings)에서 기준일 직전까지 유효한 종목별 최신 버전 (재처리 시 비교 기준)
+PREVIOUS_VERSIONS_SQL = """
+SELECT v.*
+FROM {table} v
+JOIN (
+    SELECT ticker, MAX(std_date) AS std_date
+    FROM {table}
+    WHERE std_date < :d
+    GROUP BY ticker
+) m ON v.ticker = m.ticker AND v.std_date = m.std_date
+"""
+
+
+def _normalize_value(val, decimals=6):
+    """해시 비교용으로 값을 정규화합니다. (NaN/None 통일, 실수 반올림, 공백 제거)"""
+    if val is None or (not isinstance(val, (list, dict)) and pd.isna(val)):
+        return ""
+    if isinstance(val, float):
+        # 1.0 과 1 이 다른 해시가 되지 않도록 정수형 실수는 정수로 표기
+        val = round(val, decimals)
+        return str(int(val)) if val.is_integer() else repr(val)
+    if isinstance(val, pd.Timestamp):
+        return val.strftime("%Y-%m-%d")
+    return str(val).strip()
+
+
+def compute_row_hashes(df: pd.DataFrame, key_col: str = 'ticker', ignore_cols=None, round_cols=None) -> pd.Series:
+    """
+    각 행을 정규화한 뒤 MD5 해시를 계산하여 key_col 기준 Series로 반환합니다.
+    컬럼 순서에 영향받지 않도록 컬럼명을 정렬하여 해시합니다.
+    round_cols: {컬럼: 소수 자릿수} 로 지정한 실수 컬럼은 해당 자릿수로 반올림해 비교합니다.
+    """
+    ignore = set(DEFAULT_IGNORE_COLS if ignore_cols is None else ignore_cols) | {key_col}
+    cols = sorted(c for c in df.columns if c not in ignore)
+    decimals = [(round_cols or {}).get(c, 6) for c in cols]
+
+    hashes = []
+    for row in df[cols].itertuples(index=False, name=None):
+        payload = "\x1f".join(f"{c}={_normalize_value(v, d)}" for c, v, d in zip(cols, row, decimals))
+        hashes.append(hashlib.md5(payload.encode("utf-8")).hexdigest())
+
+    return pd.Series(hashes, index=df[key_col].astype(str).values, name='row_hash')
+
+
+def _index_path(table_name: str) -> str:
+    return os.path.join(HASH_INDEX_DIR, f"{table_name}_hash_index.csv")
+
+
+def load_hash_index(table_name: str) -> dict:
+    """직전 스냅샷의 {key: hash} 인덱스를 로드합니다. 없으면 빈 딕셔너리."""
+    path = _index_path(table_name)
+    if not os.path.exists(path):
+        return {}
+
+    idx_df = pd.read_csv(path, dtype=str)
+    return dict(zip(idx_df['key'], idx_df['row_hash']))
+
+
+def save_hash_index(table_name: str, hash_index: dict):
+    """{key: hash} 인덱스를 저장합니다. (임시 파일에 쓴 뒤 교체하여 중간 손상 방지)"""
+    os.makedirs(HASH_INDEX_DIR, exist_ok=True)
+    path = _index_path(table_name)
+    tmp_path = path + ".tmp"
+
+    idx_df = pd.DataFrame({'key': list(hash_index.keys()), 'row_hash': list(hash_index.values())})
+    idx_df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def filter_changed_rows(df: pd.DataFrame, table_name: str, key_col: str = 'ticker', ignore_cols=None, round_cols=None):
+    """
+    직전 스냅샷 대비 변경(신규 포함)된 행만 남긴 DataFrame과,
+    DB 적재 성공 후 저장할 갱신된 해시 인덱스를 함께 반환합니다.
+
+    인덱스 파일을 삭제하면 다음 실행에서 전체 스냅샷이 다시 적재됩니다.
+    """
+    if df.empty:
+        return df, {}
+
+    current = compute_row_hashes(df, key_col=key_col, ignore_cols=ignore_cols, round_cols=round_cols)
+    previous = load_hash_index(table_name)
+
+    changed_mask = [previous.get(k) != h for k, h in current.items()]
+    changed_df = df[changed_mask].copy()
+
+    # 이번에 수집되지 않은 종목(일시적 수집 실패 등)의 해시는 그대로 유지
+    new_index = dict(previous)
+    new_index.update(current.to_dict())
+
+    print(f"[DELTA] {table_name}: 전체 {len(df)}건 중 변경 {len(changed_df)}건 "
+          f"(미변경 {len(df) - len(changed_df)}건 생략)")
+    return changed_df, new_index
+
+
+def load_previous_versions(table_name: str, std_date, engine=None) -> pd.DataFrame:
+    """std_date 직전까지 유효한 종목별 최신 버전 행을 DB에서 로드합니다."""
+    from sqlalchemy import text
+    if engine is None:
+        from src import db
+        engine = db.get_engine()
+    sql = text(PREVIOUS_VERSIONS_SQL.format(table=table_name))
+    return pd.read_sql(sql, engine, params={'d': str(pd.to_datetime(std_date).date())})
+
+
+def filter_changed_against(df: pd.DataFrame, previous_df: pd.DataFrame, key_col: str = 'ticker',
+                           ignore_cols=None, round_cols=None) -> pd.DataFrame:
+    """
+    previous_df(직전 버전)와 비교해 변경(신규 포함)된 행만 반환합니다.
+    해시 인덱스 파일 대신 DB의 직전 버전과 비교하므로 과거 기준일 재처리에 사용합니다.
+    """
+    if df.empty:
+        return df
+
+    current = compute_row_hashes(df, key_col=key_col, ignore_cols=ignore_cols, round_cols=round_cols)
+    previous = {}
+    if not previous_df.empty:
+        # DB에만 있는 컬럼(created_at 등)은 비교에서 제외
+        prev = previous_df[[c for c in df.columns if c in previous_df.columns]]
+        previous = compute_row_hashes(prev, key_col=key_col, ignore_cols=ignore_cols, round_cols=round_cols).to_dict()
+
+    changed_mask = [previous.get(k) != h for k, h in current.items()]
+    return df[changed_mask].copy()
@@ -1,15 +1,17 @@
 # src/dividend_scraper.py
-import requests
 import pandas as pd
 from config import NAVER_ETF_DIVIDEND_URL, HEADERS
+from src import records, ratelimit
 
 
 def get_etf_dividend_history(etf_code: str,
                              page: int = 1,
                              pageSize: int = 20,
-                             firstPageSize: int = 20) -> pd.DataFrame:
+                             firstPageSize: int = 20,
+                             archive=None) -> pd.DataFrame:
     """
     특정 ETF의 배당금 내역을 조회하여 DataFrame으로 반환합니다.
+    archive(ArchiveWriter)가 있으면 원본 응답을 보관합니다.
     """
     # URL 완성
     url = NAVER_ETF_DIVIDEND_URL.format(code=etf_code)
@@ -20,27 +22,40 @@ def get_etf_dividend_history(etf_code: str,
         "firstPageSize": firstPageSize
     }
 
+    # 버킷 준비는 아래 예외 처리 밖에서 (실패를 조용히 빈 결과로 삼키지 않음)
+    bucket = ratelimit.naver_bucket()
+
     try:
-        # 헤더 사용해서 요청
-        res = requests.get(url, headers=HEADERS, params=params, timeout=5)
+        # 헤더 사용해서 요청 (호스트 공용 요청 한도 내에서, 429면 대기 후 1회 재시도)
+        res = ratelimit.throttled_get(bucket, url, headers=HEADERS, params=params, timeout=5)
 
         if res.status_code != 200:
             return pd.DataFrame()
 
-        try:
-            js = res.json()
-        except ValueError:
-            return pd.DataFrame()
+        if archive is not None:
+            archive.append('dividend', etf_code, res.content)
 
-        data = js.get("result")
+        return parse_dividend_history(res.content, etf_code)
 
-        if not data:
-            return pd.DataFrame()
+    except Exception:
+        return pd.DataFrame()
 
-        df = pd.DataFrame(data)
-        df["종목코드"] = etf_code
 
-        return df
+def parse_dividend_history(body: bytes, etf_code: str) -> pd.DataFrame:
+    """
+    배당금 내역 응답 본문을 DataFrame으로 변환합니다. (아카이브 재처리에도 사용)
+    """
+    try:
+        js = records.loads(body)
+    except ValueError:
+        return pd.DataFrame()
 
-    except Exception:
-        return pd.DataFrame()
\ No newline at end of file
+    data = js.get("result") if isinstance(js, dict) else None
+
+    if not data:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(data)
+    df["종목코드"] = etf_code
+
+    return df
@@ -6,6 +6,7 @@ import io
 import json
 from datetime import datetime, timedelta
 from config import KRX_API_KEY, KRX_ETF_DAILY_URL, HEADERS # config에서 API KEY를 환경 변수로 읽어옴
+from src import schema, records
 
 # KRX API 응답 필드와 프로젝트에서 사용할 한글 컬럼명 매핑 (19개 항목 반영)
 COLUMN_MAPPING = {
@@ -34,10 +35,26 @@ def _get_start_date():
     """오늘 날짜를 기준으로 합니다."""
     return datetime.now()
 
-def load_latest_krx_data():
+def _post_krx(trd_dd, api_headers, archive=None):
+    """기준일자(YYYYMMDD) 1일치 KRX 응답의 OutBlock_1 리스트를 반환합니다. HTTP 오류는 예외로 전달됩니다."""
+    response = requests.post(
+        KRX_ETF_DAILY_URL,
+        headers=api_headers,
+        json={"basDd": trd_dd},
+        timeout=15
+    )
+    response.raise_for_status() # HTTP 오류 발생 시 예외 처리
+    if archive is not None:
+        archive.append('krx_etf_daily', '', response.content, date=trd_dd)
+
+    full_data = records.loads(response.content)
+    return (full_data or {}).get('OutBlock_1', [])
+
+def load_latest_krx_data(archive=None):
     """
     KRX API 명세에 따라 POST 요청으로 ETF 일간 매매 정보를 가져옵니다.
     데이터가 조회될 때까지 최대 5일 전까지 기준일자를 소급 적용합니다.
+    archive(ArchiveWriter)가 있으면 원본 응답을 보관합니다.
     """
     
     # 🚨 보안 강화: API 키가 설정되지 않았을 경우 실행 중지
@@ -61,25 +78,11 @@ def load_latest_krx_data():
         if (start_date - timedelta(days=i)).weekday() >= 5: # 0=월, 5=토, 6=일
             if i > 0: continue 
 
-        request_body = {
-            "basDd": trd_dd
-        }
-        
         print(f"[INFO] KRX API에 POST 요청을 보냅니다. 기준일자: {trd_dd} (시도 {i+1}/{max_attempts})...")
 
         try:
-            # 2. POST 요청 실행
-            response = requests.post(
-                KRX_ETF_DAILY_URL, 
-                headers=api_headers,
-                json=request_body, 
-                timeout=15
-            )
-            response.raise_for_status() # HTTP 오류 발생 시 예외 처리
-            
-            # 3. JSON 응답 처리
-            full_data = response.json()
-            data_list = full_data.get('OutBlock_1', [])
+            # 2. POST 요청 실행 + 3. JSON 응답 처리
+            data_list = _post_krx(trd_dd, api_headers, archive)
             
             if data_list:
                 df = pd.DataFrame(data_list)
@@ -104,19 +107,85 @@ def load_latest_krx_data():
         print(f"[FATAL] 최대 {max_attempts}일 소급했으나 유효한 데이터를 찾지 못했습니다. 기준일자를 수동으로 설정해야 할 수 있습니다.")
         return pd.DataFrame()
 
-    # 4. 데이터 전처리 및 컬럼 매핑 (이하 동일)
-    
+    return _build_krx_frame(df)
+
+def load_krx_data_range(start_date, end_date, archive=None):
+    """
+    start_date ~ end_date(포함) 기간의 영업일별 KRX 일간 매매 정보를 한 DataFrame으로 가져옵니다. (백필용)
+    휴장일 등 데이터가 없는 날은 건너뜁니다. archive(ArchiveWriter)가 있으면 원본 응답을 보관합니다.
+    """
+    if not KRX_API_KEY:
+        print("[FATAL] 🚨 환경 변수(KRX_API_KEY)가 설정되지 않았습니다.")
+        return pd.DataFrame()
+
+    api_headers = HEADERS.copy()
+    api_headers['Authorization'] = f'Bearer {KRX_API_KEY}'
+
+    frames = []
+    # 주말(토/일)은 제외한 영업일만 요청
+    for day in pd.bdate_range(start_date, end_date):
+        trd_dd = day.strftime("%Y%m%d")
+        try:
+            data_list = _post_krx(trd_dd, api_headers, archive)
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [401, 403]:
+                print(f"[FATAL] KRX API 요청 실패: 401/403 인증 오류. 🚨 환경 변수(KRX_API_KEY) 설정을 확인하세요.")
+                break
+            print(f"[WARN] 기준일자 {trd_dd} HTTP 오류 ({e.response.status_code}). 건너뜁니다.")
+            data_list = []
+        except Exception as e:
+            print(f"[WARN] 기준일자 {trd_dd} 처리 중 오류 발생: {e}. 건너뜁니다.")
+            data_list = []
+
+        if data_list:
+            print(f"[SUCCESS] 기준일자 {trd_dd}: {len(data_list)}개 종목")
+            frames.append(pd.DataFrame(data_list))
+        else:
+            print(f"[INFO] 기준일자 {trd_dd}: 데이터 없음 (휴장일)")
+
+        time.sleep(1) # API 부하 방지
+
+    if not frames:
+        return pd.DataFrame()
+    return _build_krx_frame(pd.concat(frames, ignore_index=True))
+
+def load_krx_data_from_archive(reader, all_dates=False):
+    """
+    보관된 실행(ArchiveReader)의 KRX 응답으로 load_latest_krx_data와 같은 결과를 만듭니다. (네트워크 없음)
+    all_dates=True 이면 보관된 모든 기준일자를 합쳐 반환합니다. (백필 실행 재처리용)
+    """
+    frames = []
+    for _ticker, trd_dd, body in reader.iter_endpoint('krx_etf_daily'):
+        data_list = (records.loads(body) or {}).get('OutBlock_1', [])
+        if data_list:
+            print(f"[REPLAY] 기준일자 {trd_dd}에 대해 {len(data_list)}개 종목 데이터를 아카이브에서 로드했습니다.")
+            frames.append(pd.DataFrame(data_list))
+            if not all_dates:
+                break
+
+    if not frames:
+        print(f"[FATAL] 아카이브({reader.run_id})에 유효한 KRX 응답이 없습니다.")
+        return pd.DataFrame()
+    return _build_krx_frame(pd.concat(frames, ignore_index=True))
+
+def _build_krx_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """KRX 응답 DataFrame의 컬럼 매핑 및 타입 변환"""
     # 컬럼명 매핑 (영문 -> 한글)
     df.rename(columns=COLUMN_MAPPING, inplace=True)
     
     # 컬럼명 통일
     df.rename(columns={'종목코드': '단축코드', '종목명': '한글종목명', '종가': '종가_KRX', '순자산가치(NAV)': 'KRX_NAV'}, inplace=True)
     
-    # 단축코드를 6자리 문자열로 변환 (Naver API 호출을 위해 필수)
-    if '단축코드' in df.columns:
-        df['단축코드'] = df['단축코드'].astype(str).str.zfill(6)
-    
-    final_cols = ['단축코드', '한글종목명', '기준일자', '종가_KRX', '순자산가치(NAV)', '시가총액', '기초지수_지수명']
-    df_selected = df[[c for c in final_cols if c in df.columns]].copy()
+    # 19개 항목 전체를 압축 타입으로 변환 + 검증 (단축코드 6자리 변환 포함, Naver API 호출을 위해 필수)
+    try:
+        df = schema.apply_krx_schema(df)
+    except ValueError as e:
+        print(f"[FATAL] KRX 데이터 검증 실패: {e}")
+        return pd.DataFrame()
+
+    # 주요 컬럼을 앞으로, 나머지 KRX 항목은 그 뒤에 유지
+    final_cols = ['단축코드', '한글종목명', '기준일자', '종가_KRX', 'KRX_NAV', '시가총액', '기초지수_지수명']
+    ordered_cols = [c for c in final_cols if c in df.columns] + [c for c in schema.KRX_DTYPES if c in df.columns and c not in final_cols]
+    df_selected = df[ordered_cols].copy()
     
     return df_selected
\ No newline at end of file
@@ -0,0 +1,268 @@
+# src/migrations.py
+from datetime import date
+from sqlalchemy import inspect, text
+from src import db, delta
+
+# 월 단위 RANGE 파티셔닝 대상 (파티션 키 컬럼)
+PARTITIONED_TABLES = {
+    'etf_daily_price': 'std_date',
+    'etf_analysis': 'std_date',
+    'etf_holdings': 'std_date',
+}
+
+# 신규 파티션 선생성 개월 수 (이번 달 포함)
+PARTITION_MONTHS_AHEAD = 3
+
+# 조회 패턴별 인덱스 (PK B-tree (std_date, ticker) 는 기준일 조회/범위 스캔을 담당)
+INDEXES = [
+    # 종목별 시계열 차트: WHERE ticker = ? ORDER BY std_date
+    "CREATE INDEX IF NOT EXISTS ix_etf_daily_price_ticker_date ON etf_daily_price (ticker, std_date DESC)",
+    # 기간 스캔: 날짜 순으로 적재되므로 BRIN이 작고 효과적
+    "CREATE INDEX IF NOT EXISTS brin_etf_daily_price_date ON etf_daily_price USING BRIN (std_date)",
+    # 종목별 최신 버전 조회 (Q1/Q2의 DISTINCT ON (ticker) ... ORDER BY ticker, std_date DESC)
+    "CREATE INDEX IF NOT EXISTS ix_etf_analysis_ticker_date ON etf_analysis (ticker, std_date DESC)",
+    "CREATE INDEX IF NOT EXISTS brin_etf_analysis_date ON etf_analysis USING BRIN (std_date)",
+    # 종목별 최신 속성 버전 (screener / Q1의 DISTINCT ON (ticker))
+    "CREATE INDEX IF NOT EXISTS ix_etf_profile_ticker_date ON etf_profile (ticker, std_date DESC)",
+    # 구성 종목: 종목별 최신 구성 / 특정 종목을 보유한 ETF 역조회
+    "CREATE INDEX IF NOT EXISTS ix_etf_holdings_ticker_date ON etf_holdings (ticker, std_date DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_etf_holdings_holding_code ON etf_holdings (holding_code)",
+    # Q2: WHERE std_date = ? AND period = '월배당' ORDER BY growth_rate_yoy DESC
+    "CREATE INDEX IF NOT EXISTS ix_etf_dividend_analysis_period ON etf_dividend_analysis (std_date, period, growth_rate_yoy DESC)",
+]
+
+
+# ------------------------------------
+# 파티션 관리
+# ------------------------------------
+
+def _month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+
+def _is_partitioned(conn, table_name: str) -> bool:
+    row = conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :t"
+    ), {'t': table_name}).first()
+    return row is not None
+
+
+def ensure_partitions(conn, table_name: str, start: date, end: date = None):
+    """start ~ end(포함)가 속한 모든 월의 파티션을 생성합니다. (이미 있으면 건너뜀)"""
+    month = _month_start(start)
+    last = _month_start(end or start)
+    while month <= last:
+        upper = _next_month(month)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table_name}_p{month:%Y%m} PARTITION OF {table_name} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        month = upper
+
+
+def ensure_partitions_for_dates(engine, table_name: str, dates):
+    """
+    적재 직전에 호출: 데이터의 기준일이 속한 월 파티션이 없으면 생성합니다.
+    Postgres가 아니거나 파티션 테이블이 아니면 아무것도 하지 않습니다.
+    """
+    if engine.dialect.name != "postgresql" or table_name not in PARTITIONED_TABLES:
+        return
+
+    months = sorted({_month_start(d) for d in dates if d is not None})
+    if not months:
+        return
+
+    with engine.begin() as conn:
+        if not _is_partitioned(conn, table_name):
+            return
+        for month in months:
+            ensure_partitions(conn, table_name, month)
+
+
+# ------------------------------------
+# 마이그레이션
+# ------------------------------------
+
+def _create_table(conn, table_name: str, name: str = None):
+    suffix = ""
+    if table_name in PARTITIONED_TABLES:
+        suffix = f" PARTITION BY RANGE ({PARTITIONED_TABLES[table_name]})"
+    conn.execute(text(db.create_table_sql(table_name, suffix=suffix, name=name)))
+
+
+def _needs_rebuild(conn, table_name: str) -> bool:
+    """
+    기존 테이블을 다시 만들어야 하는지: 파티션 대상인데 파티션 테이블이 아니거나,
+    PK가 자연키(TABLE_KEYS)와 다른 경우 (to_sql 암묵 생성으로 PK 없음, id SERIAL PK 등 → ON CONFLICT upsert 불가)
+    """
+    insp = inspect(conn)
+    if not insp.has_table(table_name):
+        return False
+    if table_name in PARTITIONED_TABLES and not _is_partitioned(conn, table_name):
+        return True
+    pk_cols = insp.get_pk_constraint(table_name).get('constrained_columns') or []
+    return list(pk_cols) != db.TABLE_KEYS[table_name]
+
+
+def _copy_expr(col: str, col_type: str) -> str:
+    """기존 컬럼 → 새 타입 변환식 (ticker는 6자리 0 채움)"""
+    base_type = col_type.replace(' NOT NULL', '').split(' DEFAULT')[0]
+    if col == 'ticker':
+        return f"LPAD(CAST({col} AS TEXT), 6, '0')"
+    if col == 'created_at':
+        return f"COALESCE(CAST({col} AS {base_type}), CURRENT_TIMESTAMP)"
+    return f"CAST({col} AS {base_type})"
+
+
+def _rebuild_from_legacy(conn, table_name: str):
+    """
+    기존 테이블을 <table>_legacy 로 이름을 바꾸고, 새 테이블(타입/PK/파티션)을 만든 뒤 데이터를 옮깁니다.
+    자연키가 중복된 행은 하나만 남기며, 키가 NULL인 행은 제외합니다. legacy 테이블은 삭제하지 않습니다.
+    """
+    legacy = f"{table_name}_legacy"
+    if inspect(conn).has_table(legacy):
+        raise RuntimeError(f"{legacy} 테이블이 이미 있습니다. 확인 후 삭제하고 다시 실행하세요.")
+
+    print(f"[MIGRATE] {table_name} → {legacy} 로 보관 후 재생성")
+    conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy}"))
+    # 기존 PK 제약명(<table>_pkey)이 새 테이블과 겹치지 않도록 함께 변경
+    pk_name = inspect(conn).get_pk_constraint(legacy).get('name')
+    if pk_name:
+        conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {pk_name} TO {legacy}_pkey"))
+    # 기존 인덱스 이름도 비워 둠 (남아 있으면 새 테이블의 CREATE INDEX IF NOT EXISTS가 건너뛰어짐)
+    index_names = conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = :t AND indexname <> :pk"
+    ), {'t': legacy, 'pk': f"{legacy}_pkey"}).scalars().all()
+    for index_name in index_names:
+        conn.execute(text(f"ALTER INDEX {index_name} RENAME TO {index_name}_legacy"))
+    _create_table(conn, table_name)
+
+    legacy_cols = {c['name'] for c in inspect(conn).get_columns(legacy)}
+    keys = db.TABLE_KEYS[table_name]
+
+    if table_name in PARTITIONED_TABLES:
+        part_col = PARTITIONED_TABLES[table_name]
+        bounds = conn.execute(text(
+            f"SELECT MIN(CAST({part_col} AS DATE)), MAX(CAST({part_col} AS DATE)) FROM {legacy}"
+        )).first()
+        if bounds[0] is not None:
+            ensure_partitions(conn, table_name, bounds[0], bounds[1])
+
+    cols = [(c, t) for c, t in db.TABLE_COLUMNS[table_name] if c in legacy_cols]
+    col_names = ", ".join(c for c, _ in cols)
+    select_exprs = ", ".join(f"{_copy_expr(c, t)} AS {c}" for c, t in cols)
+    not_null = " AND ".join(f"{k} IS NOT NULL" for k in keys)
+
+    result = conn.execute(text(
+        f"INSERT INTO {table_name} ({col_names}) "
+        f"SELECT {select_exprs} FROM {legacy} WHERE {not_null} "
+        f"ON CONFLICT ({', '.join(keys)}) DO NOTHING"
+    ))
+    print(f"[MIGRATE] {table_name}: {result.rowcount}건 이관 완료")
+
+
+def _backfill_profile(conn, source: str):
+    """
+    기존 wide etf_analysis(source)의 느리게 변하는 속성을 etf_profile 버전 행으로 옮깁니다.
+    종목별로 직전 기준일과 속성 값이 달라진 행만 새 버전으로 남깁니다.
+    변경 판단은 주간 적재(delta.PROFILE_IGNORE_COLS / PROFILE_ROUND_COLS)와 같은 규칙을 따릅니다.
+    """
+    source_cols = {c['name'] for c in inspect(conn).get_columns(source)}
+    cols = [(c, t) for c, t in db.TABLE_COLUMNS['etf_profile'] if c in source_cols]
+    ignore = set(db.TABLE_KEYS['etf_profile']) | set(delta.PROFILE_IGNORE_COLS)
+    attrs = [c for c, _ in cols if c not in ignore]
+    if not attrs:
+        return
+
+    sig_exprs = [
+        f"ROUND(CAST({c} AS NUMERIC), {delta.PROFILE_ROUND_COLS[c]})" if c in delta.PROFILE_ROUND_COLS else c
+        for c in attrs
+    ]
+    sig = f"md5(ROW({', '.join(sig_exprs)})::text)"
+    col_names = ", ".join(c for c, _ in cols)
+    select_exprs = ", ".join(f"{_copy_expr(c, t)} AS {c}" for c, t in cols)
+
+    result = conn.execute(text(
+        f"INSERT INTO etf_profile ({col_names}) "
+        f"SELECT {select_exprs} FROM ("
+        f"  SELECT *, {sig} AS sig, LAG({sig}) OVER (PARTITION BY ticker ORDER BY std_date) AS prev_sig"
+        f"  FROM {source} WHERE std_date IS NOT NULL AND ticker IS NOT NULL"
+        f") s WHERE prev_sig IS DISTINCT FROM sig "
+        f"ON CONFLICT (std_date, ticker) DO NOTHING"
+    ))
+    print(f"[MIGRATE] etf_profile: {source}에서 {result.rowcount}건 이관 완료")
+
+
+def _m001_create_tables(conn):
+    """테이블을 명시적 타입/자연키 PK/월 파티션으로 생성 (기존 테이블은 이관)"""
+    rebuilt = set()
+    for table_name in db.TABLE_COLUMNS:
+        if _needs_rebuild(conn, table_name):
+            _rebuild_from_legacy(conn, table_name)
+            rebuilt.add(table_name)
+        else:
+            _create_table(conn, table_name)
+
+    # 기존 etf_analysis는 지표+속성이 한 테이블이었으므로 속성은 etf_profile로 분리 이관
+    if 'etf_analysis' in rebuilt:
+        _backfill_profile(conn, 'etf_analysis_legacy')
+
+
+def _m002_indexes(conn):
+    """조회 패턴별 B-tree / BRIN 인덱스"""
+    for ddl in INDEXES:
+        conn.execute(text(ddl))
+
+
+MIGRATIONS = [
+    ('001_create_tables', _m001_create_tables),
+    ('002_indexes', _m002_indexes),
+]
+
+
+def pending_migrations(engine) -> list:
+    """아직 적용되지 않은 마이그레이션 버전 목록 (schema_migrations 테이블이 없으면 전체)"""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table('schema_migrations'):
+            return [version for version, _ in MIGRATIONS]
+        applied = {r[0] for r in conn.execute(text("SELECT version FROM schema_migrations"))}
+    return [version for version, _ in MIGRATIONS if version not in applied]
+
+
+def migrate(engine=None):
+    """
+    적용되지 않은 마이그레이션을 순서대로 실행합니다. (각 마이그레이션은 한 트랜잭션)
+    마지막으로 이번 달부터 PARTITION_MONTHS_AHEAD 개월의 파티션을 미리 만듭니다.
+    """
+    engine = engine or db.get_engine("postgres")
+    if engine.dialect.name != "postgresql":
+        raise ValueError("마이그레이션은 PostgreSQL 백엔드 전용입니다. (로컬 백엔드는 get_engine 시 자동 생성)")
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version VARCHAR(50) PRIMARY KEY, applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        applied = {r[0] for r in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+    for version, fn in MIGRATIONS:
+        if version in applied:
+            continue
+        print(f"[MIGRATE] {version} 적용 중...")
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:v)"), {'v': version})
+        print(f"[MIGRATE] {version} 적용 완료")
+
+    today = date.today()
+    end = _month_start(today)
+    for _ in range(PARTITION_MONTHS_AHEAD - 1):
+        end = _next_month(end)
+    with engine.begin() as conn:
+        for table_name in PARTITIONED_TABLES:
+            ensure_partitions(conn, table_name, today, end)
@@ -0,0 +1,136 @@
+# src/overlap.py
+import numpy as np
+import pandas as pd
+
+# etf_holdings 테이블에서 종목별 최신 버전의 구성 종목만 조회 (변경분만 적재되므로 종목마다 기준일이 다를 수 있음)
+LATEST_HOLDINGS_SQL = """
+SELECT h.ticker, h.rank, h.holding_code, h.holding_name, h.weight
+FROM etf_holdings h
+JOIN (
+    SELECT ticker, MAX(std_date) AS std_date
+    FROM etf_holdings
+    GROUP BY ticker
+) m ON h.ticker = m.ticker AND h.std_date = m.std_date
+"""
+
+# 변경 감지 시 비중(%) 비교 단위: 1%p (delta.PROFILE_ROUND_COLS와 같은 기준)
+HOLDINGS_WEIGHT_DECIMALS = 0
+
+
+def build_holdings_frame(basics: list, analyses: list, std_date) -> pd.DataFrame:
+    """
+    스크래퍼 결과(EtfBasicRecord, EtfAnalysisRecord 리스트)의 구성 종목을 펼쳐
+    etf_holdings 적재용 long 포맷으로 변환합니다.
+    """
+    rows = []
+    for basic, analysis in zip(basics, analyses):
+        for c in analysis.constituents or []:
+            rows.append({'std_date': std_date, 'ticker': basic.code, **c})
+
+    cols = ['std_date', 'ticker', 'rank', 'holding_code', 'holding_name', 'weight']
+    return pd.DataFrame(rows, columns=cols)
+
+
+def holdings_signature(holdings_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    종목별 구성 종목/비중을 한 행의 문자열로 요약합니다. (delta 모듈의 변경 감지용)
+    비중은 HOLDINGS_WEIGHT_DECIMALS 자릿수로 반올림하므로, 비중이 소수점 단위로만 흔들린 주는 변경으로 보지 않습니다.
+    """
+    if holdings_df.empty:
+        return pd.DataFrame(columns=['ticker', 'holdings'])
+
+    sig = (holdings_df.sort_values(['ticker', 'rank'])
+           .assign(item=lambda d: d['holding_code'].fillna(d['holding_name']).astype(str)
+                   + ':' + pd.to_numeric(d['weight'], errors='coerce').round(HOLDINGS_WEIGHT_DECIMALS).astype(str))
+           .groupby('ticker')['item'].agg('|'.join)
+           .rename('holdings')
+           .reset_index())
+    return sig
+
+
+def load_latest_holdings(engine=None) -> pd.DataFrame:
+    """DB에서 종목별 최신 구성 종목을 로드합니다."""
+    if engine is None:
+        from src import db
+        engine = db.get_engine()
+    return pd.read_sql(LATEST_HOLDINGS_SQL, engine)
+
+
+class OverlapIndex:
+    """
+    ETF × 구성종목 희소 비중 행렬을 기반으로 ETF 간 보유 종목 유사도를 계산합니다.
+
+    - cosine: 비중 벡터의 코사인 유사도 (W_n · W_nᵀ)
+    - shared_weight: 기준 ETF 비중 중 상대 ETF도 보유한 종목의 비중 합 (%) (W · Bᵀ)
+    - common_count: 공통 보유 종목 수 (B · Bᵀ)
+
+    모든 지표는 생성 시점에 희소 행렬 곱으로 한 번에 계산되며, top_k 조회는 행 하나만 읽습니다.
+    """
+
+    def __init__(self, holdings_df: pd.DataFrame):
+        # scipy는 인덱스를 만들 때만 필요하므로 여기서 import (cli.py 등 다른 경로의 로드 시간 절약)
+        from scipy import sparse
+
+        df = holdings_df.dropna(subset=['ticker']).copy()
+        # 해외 종목은 코드가 없을 수 있으므로 종목명으로 대체
+        df['constituent'] = df['holding_code'].fillna(df['holding_name'])
+        df = df.dropna(subset=['constituent'])
+        df['weight'] = pd.to_numeric(df['weight'], errors='coerce').fillna(0.0)
+        df['ticker'] = df['ticker'].astype(str)
+        # 같은 종목이 중복 기재된 경우 비중을 합산
+        df = df.groupby(['ticker', 'constituent'], as_index=False)['weight'].sum()
+
+        etf_codes = pd.Categorical(df['ticker'])
+        const_codes = pd.Categorical(df['constituent'])
+
+        self.tickers = np.asarray(etf_codes.categories)
+        self.constituents = np.asarray(const_codes.categories)
+        self._pos = {t: i for i, t in enumerate(self.tickers)}
+
+        shape = (len(self.tickers), len(self.constituents))
+        rows, cols = etf_codes.codes, const_codes.codes
+
+        self.weights = sparse.csr_matrix((df['weight'].to_numpy(dtype=np.float64), (rows, cols)), shape=shape)
+        binary = sparse.csr_matrix((np.ones(len(df)), (rows, cols)), shape=shape)
+
+        norms = np.sqrt(np.asarray(self.weights.multiply(self.weights).sum(axis=1)).ravel())
+        inv_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        normalized = sparse.diags(inv_norms) @ self.weights
+
+        self.cosine = (normalized @ normalized.T).tocsr()
+        self.shared_weight = (self.weights @ binary.T).tocsr()
+        self.common_count = (binary @ binary.T).tocsr()
+
+    def __contains__(self, ticker):
+        return str(ticker) in self._pos
+
+    def top_k(self, ticker: str, k: int = 10, metric: str = 'cosine') -> pd.DataFrame:
+        """
+        주어진 ETF와 보유 종목이 가장 많이 겹치는 상위 k개 ETF를 반환합니다.
+        metric: 'cosine' | 'shared_weight' | 'common_count'
+        """
+        if metric not in ('cosine', 'shared_weight', 'common_count'):
+            raise ValueError(f"지원하지 않는 metric입니다: {metric}")
+
+        cols = ['ticker', 'cosine', 'shared_weight', 'common_count']
+        i = self._pos.get(str(ticker))
+        if i is None:
+            return pd.DataFrame(columns=cols)
+
+        row = getattr(self, metric).getrow(i)
+        idx, vals = row.indices, row.data
+        keep = (idx != i) & (vals > 0)
+        idx, vals = idx[keep], vals[keep]
+
+        if len(idx) > k:
+            part = np.argpartition(-vals, k - 1)[:k]
+            idx, vals = idx[part], vals[part]
+        order = np.argsort(-vals, kind='stable')
+        idx = idx[order]
+
+        return pd.DataFrame({
+            'ticker': self.tickers[idx],
+            'cosine': self.cosine[i, idx].toarray().ravel().round(4),
+            'shared_weight': self.shared_weight[i, idx].toarray().ravel().round(2),
+            'common_count': self.common_count[i, idx].toarray().ravel().astype(int),
+        }, columns=cols)
@@ -0,0 +1,159 @@
+# src/ratelimit.py
+import os
+import time
+import struct
+import tempfile
+import threading
+import requests
+from config import NAVER_RATE_LIMIT, NAVER_RATE_BURST
+
+# 선택 의존성: POSIX(macOS/Linux)에서는 파일 잠금으로 프로세스 간 공유, 없으면 프로세스 내부에서만 제한
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 버킷 상태 파일 위치 (호스트 단위로 공유되도록 프로젝트 경로가 아닌 임시 디렉터리 사용)
+RATE_LIMIT_DIR = os.getenv("RATE_LIMIT_DIR", os.path.join(tempfile.gettempdir(), "etf-pipeline-ratelimit"))
+
+# 서버가 제한(HTTP 429)을 알려온 경우 버킷을 공유하는 모든 작업이 추가로 쉬는 시간 (초)
+THROTTLE_PENALTY_SEC = 30
+
+# 상태: (토큰 잔량, 마지막 갱신 시각) float64 2개
+_STATE = struct.Struct("dd")
+
+
+class SharedTokenBucket:
+    """
+    같은 호스트의 여러 프로세스가 공유하는 토큰 버킷입니다.
+    상태(잔량, 갱신 시각)는 파일 16바이트에 저장되며 flock으로 잠근 채 읽고-갱신-쓰기를 수행합니다.
+
+    acquire()는 토큰을 먼저 예약(잔량이 음수가 될 수 있음)한 뒤 잠금을 풀고 부족분만큼 대기하므로,
+    동시에 실행 중인 작업들이 요청 순서대로 슬롯을 나눠 가지며 합산 속도가 rate를 넘지 않습니다.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float):
+        if rate <= 0:
+            raise ValueError(f"rate는 0보다 커야 합니다: {rate}")
+        self.name = name
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self._lock = threading.Lock()
+        self._local_state = None
+        self._fd = None
+
+        if fcntl is not None:
+            self.path = os.path.join(RATE_LIMIT_DIR, f"{name}.bucket")
+            try:
+                os.makedirs(RATE_LIMIT_DIR, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            except OSError as e:
+                # 예) 다른 사용자가 0644로 만든 파일 → 요청 자체를 막지 않고 프로세스 내부 제한으로 동작
+                self._fall_back_to_local(e)
+        else:
+            self.path = None
+
+    def _fall_back_to_local(self, error):
+        """상태 파일을 쓸 수 없을 때: 경고 후 이 프로세스 안에서만 rate를 지킵니다."""
+        print(f"[WARN] 요청 한도 버킷 파일을 사용할 수 없어 프로세스 내부 제한으로 전환합니다 ({self.path}): {error}")
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = None
+
+    def _update(self, cost: float, ceiling: float = None) -> float:
+        """
+        잔량을 보충하고 cost만큼 차감한 뒤, 호출자가 기다려야 할 시간(초)을 반환합니다.
+        ceiling이 있으면 차감 대신 잔량을 ceiling 이하로 낮춥니다. (penalize용)
+        """
+        now = time.time()
+        if self._fd is not None:
+            raw = os.pread(self._fd, _STATE.size, 0)
+            state = _STATE.unpack(raw) if len(raw) == _STATE.size else None
+        else:
+            state = self._local_state
+
+        if state is None:
+            tokens = self.burst
+        else:
+            tokens, last = state
+            # 시계가 뒤로 가도 잔량이 줄지 않도록 경과 시간은 0 이상으로
+            tokens = min(self.burst, tokens + max(0.0, now - last) * self.rate)
+
+        if ceiling is None:
+            tokens -= cost
+        else:
+            tokens = min(tokens, ceiling)
+        new_state = (tokens, now)
+        if self._fd is not None:
+            os.pwrite(self._fd, _STATE.pack(*new_state), 0)
+        else:
+            self._local_state = new_state
+
+        return max(0.0, -tokens / self.rate)
+
+    def _locked_update(self, cost: float, ceiling: float = None) -> float:
+        with self._lock:
+            if self._fd is not None:
+                try:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+                    try:
+                        return self._update(cost, ceiling)
+                    finally:
+                        fcntl.flock(self._fd, fcntl.LOCK_UN)
+                except OSError as e:
+                    self._fall_back_to_local(e)
+            return self._update(cost, ceiling)
+
+    def acquire(self, tokens: float = 1.0):
+        """요청 1건(tokens) 분량을 예약하고, 필요하면 차례가 올 때까지 대기합니다."""
+        wait = self._locked_update(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, seconds: float = THROTTLE_PENALTY_SEC):
+        """
+        서버가 제한(HTTP 429 등)을 알려온 경우 호출: 버킷을 공유하는 모든 프로세스가 지금부터 seconds 동안 쉬게 됩니다.
+        동시에 여러 요청이 429를 받아도 대기 시간이 누적되지 않습니다.
+        """
+        self._locked_update(0.0, ceiling=-seconds * self.rate)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+_BUCKETS = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_bucket(name: str, rate: float, burst: float) -> SharedTokenBucket:
+    """이름별 버킷을 프로세스당 하나만 생성해 재사용합니다."""
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(name)
+        if bucket is None:
+            bucket = SharedTokenBucket(name, rate, burst)
+            _BUCKETS[name] = bucket
+        return bucket
+
+
+def naver_bucket() -> SharedTokenBucket:
+    """m.stock.naver.com 요청 공용 버킷 (NAVER_RATE_LIMIT 초당 요청 수, NAVER_RATE_BURST 순간 허용량)"""
+    return get_bucket("naver", NAVER_RATE_LIMIT, NAVER_RATE_BURST)
+
+
+def throttled_get(bucket: SharedTokenBucket, url: str, retries_on_429: int = 1, **kwargs) -> requests.Response:
+    """
+    bucket 한도 내에서 GET 요청을 보냅니다.
+    429를 받으면 penalize()로 공유 대기를 건 뒤, 대기가 끝나면 retries_on_429회까지 다시 요청합니다.
+    네트워크 예외는 호출자에게 그대로 전달됩니다.
+    """
+    for attempt in range(retries_on_429 + 1):
+        bucket.acquire()
+        response = requests.get(url, **kwargs)
+        if response.status_code != 429 or attempt == retries_on_429:
+            return response
+        bucket.penalize()
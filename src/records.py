@@ -0,0 +1,128 @@
+# src/records.py
+import json
+import pandas as pd
+
+# 선택 의존성: 설치되어 있으면 빠른 JSON 디코더 사용, 없으면 표준 라이브러리 json
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(raw):
+    """bytes/str JSON을 파싱합니다. (orjson → json 순서로 사용)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# ------------------------------------
+# 레코드 타입 (__slots__: 종목당 dict 대신 고정 필드 객체)
+# ------------------------------------
+
+class _Record:
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        for field in self.__slots__:
+            setattr(self, field, kwargs.get(field))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class EtfBasicRecord(_Record):
+    """기본 시세 (/api/stock/{code}/basic)"""
+    __slots__ = ('code', 'name', 'price', 'change_rate')
+
+
+class EtfAnalysisRecord(_Record):
+    """상세 분석 (/api/stock/{code}/etfAnalysis). constituents는 DataFrame 컬럼이 아닌 etf_holdings용"""
+    __slots__ = (
+        'nav', 'market_cap', 'fee', 'distribution_yield', 'deviation_rate',
+        'issuer', 'listed_date', 'tracking_index', 'tracking_error', 'inflow_1m',
+        'return_1m', 'return_6m', 'return_1y',
+        'top_holdings', 'sector_weight', 'country_weight',
+        'constituents',
+    )
+
+    frame_exclude = ('constituents',)
+
+
+def records_to_frame(*record_lists) -> pd.DataFrame:
+    """
+    같은 길이의 레코드 리스트들을 컬럼 단위로 한 번에 DataFrame으로 변환합니다.
+    예) records_to_frame(basics, analyses) -> basic 컬럼 + analysis 컬럼
+    """
+    columns = {}
+    for records in record_lists:
+        if not records:
+            continue
+        cls = type(records[0])
+        exclude = getattr(cls, 'frame_exclude', ())
+        for field in cls.__slots__:
+            if field not in exclude:
+                columns[field] = [getattr(r, field) for r in records]
+    return pd.DataFrame(columns)
+
+
+# ------------------------------------
+# 응답 디코딩
+# msgspec이 있으면 필요한 필드만 정의한 Struct로 디코딩하여
+# 나머지(대용량 포트폴리오 리스트 등)는 객체를 만들지 않고 건너뜁니다.
+# ------------------------------------
+
+if msgspec is not None:
+    class _BasicPayload(msgspec.Struct):
+        itemCode: object = None
+        stockName: object = None
+        closePrice: object = None
+        fluctuationsRatio: object = None
+
+    class _AnalysisPayload(msgspec.Struct):
+        nav: object = None
+        marketValue: object = None
+        totalFee: object = None
+        deviationRate: object = None
+        issuerName: object = None
+        listedDate: object = None
+        etfBaseIndex: object = None
+        chaseErrorRate: object = None
+        themeReturns: object = None
+        dividend: object = None
+        cumulativeNetInflowList: object = None
+        etfTop10MajorConstituentAssets: object = None
+        sectorPortfolioList: object = None
+        countryPortfolioList: object = None
+
+    _DECODERS = {
+        'basic': msgspec.json.Decoder(_BasicPayload),
+        'analysis': msgspec.json.Decoder(_AnalysisPayload),
+    }
+else:
+    _DECODERS = {}
+
+
+def decode_payload(raw, kind: str):
+    """
+    Naver 응답 본문(bytes)을 dict로 디코딩합니다.
+    kind('basic' | 'analysis')에 해당하는 msgspec 스키마가 있으면 필요한 키만 담긴 dict를 반환합니다.
+    JSON 형식이 잘못된 경우 디코더 예외가 그대로 전달됩니다.
+    """
+    decoder = _DECODERS.get(kind)
+    if decoder is not None:
+        try:
+            payload = decoder.decode(raw)
+        except msgspec.ValidationError:
+            # 최상위가 객체가 아닌 경우(null 등)는 일반 파싱 결과를 그대로 반환
+            return loads(raw)
+        return {f: getattr(payload, f) for f in payload.__struct_fields__}
+    return loads(raw)
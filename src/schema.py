@@ -0,0 +1,131 @@
+# src/schema.py
+import re
+import pandas as pd
+
+# KRX 일간 시세 (loader.COLUMN_MAPPING 19개 항목, 컬럼명 통일 후 기준) -> 저장용 dtype
+# - 종목코드/종목명/지수명은 스냅샷·패널에서 반복되므로 category
+# - 가격은 int32 (ETF 가격 범위), 거래량/금액/시가총액은 int64
+# - 결측('-', '')이 올 수 있어 정수형은 nullable(Int32/Int64) 사용
+KRX_DTYPES = {
+    '기준일자': 'datetime64[ns]',
+    '단축코드': 'category',
+    '한글종목명': 'category',
+    '종가_KRX': 'Int32',
+    '대비': 'Int32',
+    '등락률': 'float32',
+    'KRX_NAV': 'float64',
+    '시가': 'Int32',
+    '고가': 'Int32',
+    '저가': 'Int32',
+    '거래량': 'Int64',
+    '거래대금': 'Int64',
+    '시가총액': 'Int64',
+    '순자산총액': 'Int64',
+    '상장좌수': 'Int64',
+    '기초지수_지수명': 'category',
+    '기초지수_종가': 'float64',
+    '기초지수_대비': 'float32',
+    '기초지수_등락률': 'float32',
+}
+
+KRX_REQUIRED_COLS = ['기준일자', '단축코드', '한글종목명', '종가_KRX']
+
+# etf_analysis / etf_profile 적재용 (Naver 수집 결과, 전처리 후 테이블 분리 전 기준)
+ANALYSIS_DTYPES = {
+    'ticker': 'category',
+    'name': 'category',
+    'issuer': 'category',
+    'listed_date': 'datetime64[ns]',
+    'std_date': 'datetime64[ns]',
+    'nav': 'float64',
+    'price': 'float64',
+    'market_cap': 'float64',
+    'inflow_1m': 'float64',
+    'fee': 'float64',
+    'distribution_yield': 'float64',
+    'tracking_error': 'float64',
+    'return_1m': 'float64',
+    'return_6m': 'float64',
+    'return_1y': 'float64',
+}
+for _i in range(1, 4):
+    ANALYSIS_DTYPES[f'sector_{_i}'] = 'category'
+    ANALYSIS_DTYPES[f'sector_{_i}_pct'] = 'float64'
+    ANALYSIS_DTYPES[f'country_{_i}'] = 'category'
+    ANALYSIS_DTYPES[f'country_{_i}_pct'] = 'float64'
+
+# 종목코드: 6자리 영숫자 (예: 069500, 0000D0)
+TICKER_PATTERN = re.compile(r"^[0-9A-Z]{6}$")
+
+
+def normalize_ticker(series: pd.Series) -> pd.Series:
+    """종목코드를 6자리 고정폭 문자열로 맞춥니다."""
+    return series.astype(str).str.strip().str.upper().str.zfill(6)
+
+
+def _coerce(series: pd.Series, dtype: str) -> pd.Series:
+    """문자열로 들어온 값을 dtype에 맞게 변환합니다. 변환 불가 값은 결측 처리."""
+    if dtype == 'category':
+        return series.astype('category')
+    if dtype.startswith('datetime'):
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.astype(dtype)
+        s = series.astype(str).str.replace(r"[./]", "-", regex=True)
+        # 'YYYYMMDD' 또는 'YYYY-MM-DD'
+        s = s.where(~s.str.fullmatch(r"\d{8}"), s.str[:4] + '-' + s.str[4:6] + '-' + s.str[6:])
+        return pd.to_datetime(s, errors='coerce').astype(dtype)
+
+    if not pd.api.types.is_numeric_dtype(series):
+        series = series.astype(str).str.replace(",", "", regex=False).str.strip()
+    numeric = pd.to_numeric(series, errors='coerce')
+
+    if dtype.startswith('Int'):
+        # 소수점이 붙어 오는 정수값(예: '1000.0')은 반올림하여 정수로
+        return numeric.round().astype(dtype)
+    return numeric.astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame, dtypes: dict, required=(), label="DataFrame") -> pd.DataFrame:
+    """
+    dtypes에 정의된 컬럼을 지정한 타입으로 변환하고 경계 검증을 수행합니다.
+    - 필수 컬럼 누락 시 ValueError
+    - 원래 값이 있었는데 변환 후 결측이 된 값은 [SCHEMA WARN]으로 알립니다.
+    """
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"[SCHEMA] {label}에 필수 컬럼이 없습니다: {missing}")
+
+    df = df.copy()
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+
+        raw = df[col]
+        typed = _coerce(raw, dtype)
+
+        had_value = raw.notna() & ~raw.astype(str).str.strip().isin(["", "-", "N/A", "null", "nan", "None"])
+        lost = int((had_value & typed.isna()).sum())
+        if lost:
+            print(f"[SCHEMA WARN] {label}.{col}: {lost}건을 {dtype}로 변환하지 못해 결측 처리했습니다.")
+
+        df[col] = typed
+
+    return df
+
+
+def apply_krx_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """KRX 일간 시세 DataFrame(컬럼명 통일 후)을 압축 타입으로 변환하고 검증합니다."""
+    if '단축코드' in df.columns:
+        df = df.assign(단축코드=normalize_ticker(df['단축코드']))
+        invalid = ~df['단축코드'].str.match(TICKER_PATTERN)
+        if invalid.any():
+            raise ValueError(f"[SCHEMA] 잘못된 종목코드 {int(invalid.sum())}건: {df.loc[invalid, '단축코드'].head(5).tolist()}")
+
+    return apply_schema(df, KRX_DTYPES, required=KRX_REQUIRED_COLS, label="krx_daily")
+
+
+def apply_analysis_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """etf_analysis / etf_profile 적재용 DataFrame을 지정 타입으로 변환하고 검증합니다."""
+    if 'ticker' in df.columns:
+        df = df.assign(ticker=normalize_ticker(df['ticker']))
+    return apply_schema(df, ANALYSIS_DTYPES, required=['ticker'], label="etf_analysis")
@@ -1,27 +1,33 @@
 # src/scraper.py
-import requests
-import time
-import pandas as pd
 from config import NAVER_STOCK_API_URL, NAVER_ETF_ANALYSIS_URL, HEADERS
+from src import records, ratelimit
 
-def fetch_etf_basic(item_code):
-    """기본 시세 정보를 가져옵니다."""
+def fetch_etf_basic(item_code, archive=None):
+    """기본 시세 정보를 가져옵니다. archive(ArchiveWriter)가 있으면 원본 응답을 보관합니다."""
     url = NAVER_STOCK_API_URL.format(code=item_code)
+    # 버킷 준비는 아래 예외 처리 밖에서 (실패를 조용히 None으로 삼키지 않음)
+    bucket = ratelimit.naver_bucket()
     try:
-        response = requests.get(url, headers=HEADERS, timeout=5)
+        response = ratelimit.throttled_get(bucket, url, headers=HEADERS, timeout=5)
         response.raise_for_status()
-        return parse_etf_basic(response.json())
+        if archive is not None:
+            archive.append('basic', item_code, response.content)
+        return parse_etf_basic(records.decode_payload(response.content, 'basic'))
     except Exception as e:
         # print(f"[ERROR] {item_code} 기본 정보 실패: {e}")
         return None
 
-def fetch_etf_analysis(item_code):
-    """ETF 운용 상세 분석 정보를 가져옵니다."""
+def fetch_etf_analysis(item_code, archive=None):
+    """ETF 운용 상세 분석 정보를 가져옵니다. archive(ArchiveWriter)가 있으면 원본 응답을 보관합니다."""
     url = NAVER_ETF_ANALYSIS_URL.format(code=item_code)
+    # 버킷 준비는 아래 예외 처리 밖에서 (실패를 조용히 None으로 삼키지 않음)
+    bucket = ratelimit.naver_bucket()
     try:
-        response = requests.get(url, headers=HEADERS, timeout=5)
+        response = ratelimit.throttled_get(bucket, url, headers=HEADERS, timeout=5)
         response.raise_for_status()
-        return parse_etf_analysis(response.json())
+        if archive is not None:
+            archive.append('analysis', item_code, response.content)
+        return parse_etf_analysis(records.decode_payload(response.content, 'analysis'))
     except Exception as e:
         # print(f"[ERROR] {item_code} 분석 정보 실패: {e}")
         return None
@@ -43,6 +49,33 @@ def _parse_weight_list(data_list, top_n=3):
         
     return ", ".join(items)
 
+def _to_weight(val):
+    """'24.5%', '24.5', 24.5 형태의 비중 값을 float으로 변환합니다."""
+    if val is None:
+        return None
+    try:
+        return float(str(val).replace('%', '').replace(',', '').strip())
+    except ValueError:
+        return None
+
+def _parse_constituents(data_list, top_n=10):
+    """
+    구성 종목 리스트를 받아 상위 N개 종목의 코드/이름/비중을 리스트로 반환합니다.
+    """
+    if not data_list:
+        return []
+
+    constituents = []
+    for rank, item in enumerate(data_list[:top_n], start=1):
+        constituents.append({
+            "rank": rank,
+            "holding_code": item.get('itemCode'),
+            "holding_name": item.get('itemName'),
+            "weight": _to_weight(item.get('etfWeight', item.get('weight'))),
+        })
+
+    return constituents
+
 def _format_date(date_str):
     """YYYYMMDD -> YYYY-MM-DD 변환"""
     if date_str and len(date_str) == 8:
@@ -52,45 +85,46 @@ def _format_date(date_str):
 def parse_etf_basic(json_data):
     if not json_data: return None
     try:
-        close_price = int(json_data.get('closePrice', '0').replace(',', ''))
+        close_price = int(str(json_data.get('closePrice') or '0').replace(',', ''))
     except ValueError:
         close_price = 0
 
-    return {
-        "code": json_data.get("itemCode"),
-        "name": json_data.get("stockName"),
-        "price": close_price,
-        "change_rate": json_data.get("fluctuationsRatio"),
-    }
+    return records.EtfBasicRecord(
+        code=json_data.get("itemCode"),
+        name=json_data.get("stockName"),
+        price=close_price,
+        change_rate=json_data.get("fluctuationsRatio"),
+    )
 
 def parse_etf_analysis(json_data):
     if not json_data: return None
     
-    returns = json_data.get("themeReturns", {})
-    dividend_info = json_data.get("dividend", {})
-    inflow_info = json_data.get("cumulativeNetInflowList", {})
+    returns = json_data.get("themeReturns") or {}
+    dividend_info = json_data.get("dividend") or {}
+    inflow_info = json_data.get("cumulativeNetInflowList") or {}
     
-    top_assets = json_data.get("etfTop10MajorConstituentAssets", [])
-    top_5_names = [item['itemName'] for item in top_assets[:5]]
+    constituents = _parse_constituents(json_data.get("etfTop10MajorConstituentAssets"), top_n=10)
+    top_5_names = [c['holding_name'] for c in constituents[:5] if c['holding_name']]
     
-    return {
-        "nav": json_data.get("nav"),
-        "market_cap": json_data.get("marketValue"),
-        "fee": json_data.get("totalFee"),
-        "distribution_yield": dividend_info.get("dividendYieldTtm"),
-        "deviation_rate": json_data.get("deviationRate"),
+    return records.EtfAnalysisRecord(
+        nav=json_data.get("nav"),
+        market_cap=json_data.get("marketValue"),
+        fee=json_data.get("totalFee"),
+        distribution_yield=dividend_info.get("dividendYieldTtm"),
+        deviation_rate=json_data.get("deviationRate"),
         
-        "issuer": json_data.get("issuerName"),
-        "listed_date": _format_date(json_data.get("listedDate")),
-        "tracking_index": json_data.get("etfBaseIndex"),
-        "tracking_error": json_data.get("chaseErrorRate"),
-        "inflow_1m": inflow_info.get("cumulativeNetInflow1m"),
+        issuer=json_data.get("issuerName"),
+        listed_date=_format_date(json_data.get("listedDate")),
+        tracking_index=json_data.get("etfBaseIndex"),
+        tracking_error=json_data.get("chaseErrorRate"),
+        inflow_1m=inflow_info.get("cumulativeNetInflow1m"),
         
-        "return_1m": returns.get("returnRate1m"),
-        "return_6m": returns.get("returnRate6m"),
-        "return_1y": returns.get("returnRate1y"),
+        return_1m=returns.get("returnRate1m"),
+        return_6m=returns.get("returnRate6m"),
+        return_1y=returns.get("returnRate1y"),
         
-        "top_holdings": ", ".join(top_5_names),
-        "sector_weight": _parse_weight_list(json_data.get("sectorPortfolioList"), top_n=3),
-        "country_weight": _parse_weight_list(json_data.get("countryPortfolioList"), top_n=3),
-    }
\ No newline at end of file
+        top_holdings=", ".join(top_5_names),
+        constituents=constituents,
+        sector_weight=_parse_weight_list(json_data.get("sectorPortfolioList"), top_n=3),
+        country_weight=_parse_weight_list(json_data.get("countryPortfolioList"), top_n=3),
+    )
\ No newline at end of file
@@ -0,0 +1,331 @@
+# src/screener.py
+import numpy as np
+import pandas as pd
+
+# 범주형 컬럼: 사전 인코딩(dictionary encoding) + 값별 비트맵 인덱스
+CATEGORICAL_COLS = [
+    'sector_1', 'sector_2', 'sector_3',
+    'country_1', 'country_2', 'country_3',
+    'issuer', 'period',
+]
+
+# 수치형 컬럼: 정렬 인덱스 (범위 필터 + 정렬)
+NUMERIC_COLS = [
+    'nav', 'price', 'market_cap', 'inflow_1m', 'fee', 'distribution_yield', 'tracking_error',
+    'return_1m', 'return_6m', 'return_1y',
+    'sector_1_pct', 'sector_2_pct', 'sector_3_pct',
+    'country_1_pct', 'country_2_pct', 'country_3_pct',
+    'dividend_sum_1y', 'growth_rate_yoy',
+]
+
+# 결과 출력용으로만 보관하는 컬럼
+LABEL_COLS = ['ticker', 'name']
+
+# 최신 주간 지표 스냅샷(etf_analysis) + 종목별 최신 속성 버전(etf_profile)
+# - etf_analysis는 매주 전 종목을 적재하므로 최신 기준일 하나만 사용 (상장폐지/수집 실패 종목의 과거 행 제외)
+# - etf_profile은 속성이 바뀐 종목만 적재되므로 종목마다 버전 시작일이 다름
+_PROFILE_SELECT_COLS = ['issuer', 'fee'] + [
+    f'{p}_{i}{s}' for i in range(1, 4) for p in ('sector', 'country') for s in ('', '_pct')
+]
+
+_LATEST_SNAPSHOT_WHERE = "a.std_date = (SELECT MAX(std_date) FROM etf_analysis)"
+
+_LATEST_SNAPSHOT_SELECT = f"""
+SELECT a.*, {', '.join('p.' + c for c in _PROFILE_SELECT_COLS)}
+FROM etf_analysis a
+LEFT JOIN (
+    SELECT ticker, MAX(std_date) AS std_date
+    FROM etf_profile
+    GROUP BY ticker
+) pm ON a.ticker = pm.ticker
+LEFT JOIN etf_profile p ON p.ticker = pm.ticker AND p.std_date = pm.std_date
+WHERE {_LATEST_SNAPSHOT_WHERE}
+"""
+
+LATEST_ANALYSIS_SQL = _LATEST_SNAPSHOT_SELECT + """
+ORDER BY a.ticker
+"""
+
+# 최신 스냅샷 중 as_of 이후 지표(새 주간 스냅샷) 또는 속성이 새로 적재된 종목 (증분 갱신용)
+CHANGED_SINCE_SQL = _LATEST_SNAPSHOT_SELECT + """
+  AND (a.std_date > :as_of OR a.ticker IN (SELECT ticker FROM etf_profile WHERE std_date > :as_of))
+ORDER BY a.ticker
+"""
+
+# 최신 스냅샷에 포함된 종목 목록 (스냅샷에서 빠진 종목 제거용)
+LATEST_TICKERS_SQL = f"""
+SELECT a.ticker FROM etf_analysis a WHERE {_LATEST_SNAPSHOT_WHERE}
+"""
+
+LATEST_DIVIDEND_SQL = """
+SELECT ticker, period, dividend_sum_1y, growth_rate_yoy, std_date
+FROM etf_dividend_analysis
+WHERE std_date = (SELECT MAX(std_date) FROM etf_dividend_analysis)
+"""
+
+
+def _merge_snapshot(analysis_df: pd.DataFrame, dividend_df: pd.DataFrame = None) -> pd.DataFrame:
+    """etf_analysis 스냅샷에 배당 분석 지표를 ticker 기준으로 붙입니다."""
+    df = analysis_df.copy()
+    df['ticker'] = df['ticker'].astype(str)
+
+    if dividend_df is not None and not dividend_df.empty:
+        div = dividend_df[[c for c in ['ticker', 'period', 'dividend_sum_1y', 'growth_rate_yoy'] if c in dividend_df.columns]].copy()
+        div['ticker'] = div['ticker'].astype(str)
+        df = df.drop(columns=[c for c in div.columns if c != 'ticker' and c in df.columns])
+        df = df.merge(div, on='ticker', how='left')
+
+    return df
+
+
+class ScreeningEngine:
+    """
+    최신 etf_analysis + etf_profile + etf_dividend_analysis 스냅샷을 NumPy 컬럼 배열로 올려두고
+    필터 + 정렬 + top-k 스크리닝을 DB 왕복 없이 메모리에서 처리합니다.
+
+    - 범주형 컬럼: 사전 인코딩 후 값별 packed 비트맵 (np.packbits) → 비트 AND/OR 로 필터
+    - 수치형 컬럼: NaN을 제외한 정렬 인덱스 → searchsorted 로 범위 필터, 정렬 순서 재사용
+    """
+
+    def __init__(self, snapshot_df: pd.DataFrame):
+        self._load(snapshot_df.drop_duplicates(subset=['ticker'], keep='last').reset_index(drop=True))
+
+    @classmethod
+    def from_frames(cls, analysis_df: pd.DataFrame, dividend_df: pd.DataFrame = None):
+        return cls(_merge_snapshot(analysis_df, dividend_df))
+
+    @classmethod
+    def from_db(cls, engine=None):
+        """DB에서 최신 스냅샷을 로드하여 엔진을 생성합니다."""
+        if engine is None:
+            from src import db
+            engine = db.get_engine()
+        analysis_df = pd.read_sql(LATEST_ANALYSIS_SQL, engine)
+        dividend_df = pd.read_sql(LATEST_DIVIDEND_SQL, engine)
+        return cls.from_frames(analysis_df, dividend_df)
+
+    # ------------------------------------
+    # 인덱스 구성
+    # ------------------------------------
+
+    def _load(self, df: pd.DataFrame):
+        self.size = len(df)
+        self._row_of = {t: i for i, t in enumerate(df['ticker'].astype(str))}
+        # pandas 3.x의 to_numpy()는 읽기 전용 뷰를 줄 수 있으므로, 증분 갱신으로 덮어쓸 배열은 복사본으로 보관
+        self.labels = {c: np.array(df[c], dtype=object, copy=True) for c in LABEL_COLS if c in df.columns}
+
+        self.codes, self.dictionaries, self.bitmaps = {}, {}, {}
+        for col in CATEGORICAL_COLS:
+            if col in df.columns:
+                self._build_categorical(col, df[col])
+
+        self.values, self.sorted_index = {}, {}
+        for col in NUMERIC_COLS:
+            if col in df.columns:
+                self.values[col] = np.array(pd.to_numeric(df[col], errors='coerce'), dtype=np.float64, copy=True)
+                self._build_sorted(col)
+
+        self.as_of = pd.to_datetime(df['std_date']).max() if 'std_date' in df.columns and len(df) else None
+
+    def _build_categorical(self, col, series: pd.Series):
+        cat = pd.Categorical(series.where(series.notna(), None))
+        codes = cat.codes.astype(np.int32)
+        self.codes[col] = codes
+        self.dictionaries[col] = {v: i for i, v in enumerate(cat.categories)}
+        self.bitmaps[col] = {
+            i: np.packbits(codes == i) for i in range(len(cat.categories))
+        }
+
+    def _build_sorted(self, col):
+        vals = self.values[col]
+        valid = np.flatnonzero(~np.isnan(vals))
+        order = valid[np.argsort(vals[valid], kind='stable')]
+        self.sorted_index[col] = (order, vals[order])
+
+    # ------------------------------------
+    # 비트맵 연산
+    # ------------------------------------
+
+    def _all_bits(self):
+        return np.packbits(np.ones(self.size, dtype=bool))
+
+    def _eq_bits(self, col, value):
+        """범주형 컬럼 = value (리스트/튜플/집합이면 IN) 비트맵"""
+        if col not in self.bitmaps:
+            raise KeyError(f"범주형 인덱스가 없는 컬럼입니다: {col}")
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+
+        bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for v in values:
+            code = self.dictionaries[col].get(v)
+            if code is not None:
+                bits |= self.bitmaps[col][code]
+        return bits
+
+    def _range_bits(self, col, lo=None, hi=None):
+        """수치형 컬럼 lo <= x <= hi 비트맵 (None은 해당 방향 무제한)"""
+        if col not in self.sorted_index:
+            raise KeyError(f"수치형 인덱스가 없는 컬럼입니다: {col}")
+        order, sorted_vals = self.sorted_index[col]
+
+        left = 0 if lo is None else np.searchsorted(sorted_vals, lo, side='left')
+        right = len(sorted_vals) if hi is None else np.searchsorted(sorted_vals, hi, side='right')
+
+        mask = np.zeros(self.size, dtype=bool)
+        mask[order[left:right]] = True
+        return np.packbits(mask)
+
+    # ------------------------------------
+    # 조회
+    # ------------------------------------
+
+    def select(self, eq: dict = None, ranges: dict = None, order_by: str = None,
+               descending: bool = True, k: int = None) -> np.ndarray:
+        """
+        필터 + 정렬 + top-k 결과의 행 번호 배열을 반환합니다. (DataFrame 생성 비용 없음)
+        order_by 컬럼이 NaN인 행은 결과에서 제외됩니다.
+        """
+        bits = self._all_bits()
+        for col, value in (eq or {}).items():
+            bits &= self._eq_bits(col, value)
+        for col, (lo, hi) in (ranges or {}).items():
+            bits &= self._range_bits(col, lo, hi)
+
+        mask = np.unpackbits(bits, count=self.size).astype(bool)
+
+        if order_by is not None:
+            if order_by not in self.sorted_index:
+                raise KeyError(f"수치형 인덱스가 없는 컬럼입니다: {order_by}")
+            order = self.sorted_index[order_by][0]
+            rows = order[mask[order]]
+            if descending:
+                rows = rows[::-1]
+        else:
+            rows = np.flatnonzero(mask)
+
+        if k is not None:
+            rows = rows[:k]
+
+        return rows
+
+    def query(self, eq: dict = None, ranges: dict = None, order_by: str = None,
+              descending: bool = True, k: int = None, columns: list = None) -> pd.DataFrame:
+        """
+        필터 + 정렬 + top-k 조회 결과를 DataFrame으로 반환합니다.
+
+        예) Q1: 시가총액 1,000억 이상, 미국 비중 1위 50% 이상
+            engine.query(eq={'country_1': '미국'},
+                         ranges={'market_cap': (1000, None), 'country_1_pct': (50, None)},
+                         order_by='market_cap')
+
+        예) Q2: 월배당 ETF를 배당성장률 순으로
+            engine.query(eq={'period': '월배당'}, order_by='growth_rate_yoy')
+        """
+        rows = self.select(eq=eq, ranges=ranges, order_by=order_by, descending=descending, k=k)
+        return self._materialize(rows, columns)
+
+    def _materialize(self, rows, columns=None) -> pd.DataFrame:
+        if columns is None:
+            columns = list(self.labels) + list(self.codes) + list(self.values)
+
+        out = {}
+        for col in columns:
+            if col in self.labels:
+                out[col] = self.labels[col][rows]
+            elif col in self.codes:
+                categories = np.array(list(self.dictionaries[col]) + [None], dtype=object)
+                out[col] = categories[self.codes[col][rows]]  # code -1(NULL) → 마지막 None
+            elif col in self.values:
+                out[col] = self.values[col][rows]
+            else:
+                raise KeyError(f"알 수 없는 컬럼입니다: {col}")
+        return pd.DataFrame(out, columns=columns)
+
+    # ------------------------------------
+    # 증분 갱신
+    # ------------------------------------
+
+    def apply_changes(self, changed_df: pd.DataFrame):
+        """
+        새 스냅샷에서 바뀐 행(신규 종목 포함)만 반영합니다.
+        기존 종목은 해당 행의 값만 교체하고, 값이 실제로 바뀐 컬럼의 인덱스만 다시 만듭니다.
+        신규 종목이 있으면 전체를 다시 적재합니다.
+        """
+        if changed_df.empty:
+            return
+
+        changed_df = changed_df.drop_duplicates(subset=['ticker'], keep='last').copy()
+        changed_df['ticker'] = changed_df['ticker'].astype(str)
+
+        if not changed_df['ticker'].isin(self._row_of).all():
+            merged = pd.concat([self.to_frame(), changed_df], ignore_index=True)
+            self._load(merged.drop_duplicates(subset=['ticker'], keep='last').reset_index(drop=True))
+            return
+
+        rows = changed_df['ticker'].map(self._row_of).to_numpy()
+
+        for col in LABEL_COLS:
+            if col in changed_df.columns and col in self.labels:
+                self.labels[col][rows] = changed_df[col].to_numpy(dtype=object)
+
+        for col in self.codes:
+            if col not in changed_df.columns:
+                continue
+            current = self._materialize(rows, [col])[col].to_numpy()
+            incoming = changed_df[col].where(changed_df[col].notna(), None).to_numpy(dtype=object)
+            if not np.array_equal(current, incoming):
+                full = np.array(self._materialize(np.arange(self.size), [col])[col], dtype=object, copy=True)
+                full[rows] = incoming
+                self._build_categorical(col, pd.Series(full))
+
+        for col in self.values:
+            if col not in changed_df.columns:
+                continue
+            incoming = np.array(pd.to_numeric(changed_df[col], errors='coerce'), dtype=np.float64, copy=True)
+            if not np.array_equal(self.values[col][rows], incoming, equal_nan=True):
+                self.values[col][rows] = incoming
+                self._build_sorted(col)
+
+        if 'std_date' in changed_df.columns:
+            latest = pd.to_datetime(changed_df['std_date']).max()
+            self.as_of = latest if self.as_of is None else max(self.as_of, latest)
+
+    def drop_tickers(self, tickers):
+        """주어진 종목을 스냅샷에서 제거합니다. (행 번호가 바뀌므로 인덱스를 다시 만듦)"""
+        tickers = {str(t) for t in tickers} & set(self._row_of)
+        if not tickers:
+            return
+        df = self.to_frame()
+        self._load(df[~df['ticker'].astype(str).isin(tickers)].reset_index(drop=True))
+
+    def refresh_from_db(self, engine=None):
+        """
+        마지막 기준일 이후 적재된 etf_analysis/etf_profile 변경분과 최신 배당 분석을 반영합니다.
+        최신 etf_analysis 스냅샷에 없는 종목(상장폐지, 수집 실패 등)은 제거합니다.
+        """
+        if engine is None:
+            from src import db
+            engine = db.get_engine()
+
+        from sqlalchemy import text
+        if self.as_of is None:
+            changed = pd.read_sql(LATEST_ANALYSIS_SQL, engine)
+        else:
+            changed = pd.read_sql(text(CHANGED_SINCE_SQL), engine, params={'as_of': self.as_of.date()})
+            latest_tickers = set(pd.read_sql(LATEST_TICKERS_SQL, engine)['ticker'].astype(str))
+            self.drop_tickers(set(self._row_of) - latest_tickers)
+        dividend_df = pd.read_sql(LATEST_DIVIDEND_SQL, engine)
+
+        # 배당 분석은 매 실행 전체 스냅샷이므로, 분석 변경분이 없는 종목도 배당 지표는 갱신
+        div_changed = dividend_df.drop(columns=['std_date'], errors='ignore')
+        if not changed.empty:
+            changed = _merge_snapshot(changed, dividend_df)
+        self.apply_changes(changed)
+        self.apply_changes(div_changed[div_changed['ticker'].astype(str).isin(self._row_of)])
+
+    def to_frame(self) -> pd.DataFrame:
+        """현재 적재된 스냅샷을 DataFrame으로 되돌립니다."""
+        df = self._materialize(np.arange(self.size))
+        if self.as_of is not None:
+            df['std_date'] = self.as_of
+        return df
@@ -0,0 +1,160 @@
+# src/sync.py
+import pandas as pd
+from sqlalchemy import inspect, text
+from src import db, migrations
+
+# 동기화 순서 및 날짜 단위 교체 기준 컬럼
+SYNC_TABLES = db.SYNC_DATE_COLS
+
+
+def _remote_columns(remote_engine, table_name):
+    """원격 테이블 컬럼 목록 (테이블이 없으면 None)"""
+    insp = inspect(remote_engine)
+    if not insp.has_table(table_name):
+        return None
+    return [c['name'] for c in insp.get_columns(table_name)]
+
+
+def _remote_watermark(remote_engine, table_name, column):
+    """원격 테이블의 마지막 적재 기준일"""
+    df = pd.read_sql(text(f"SELECT MAX({column}) AS wm FROM {table_name}"), remote_engine)
+    wm = df['wm'].iloc[0]
+    return None if pd.isna(wm) else pd.to_datetime(wm).date()
+
+
+def _to_dates(values):
+    return {d for d in pd.to_datetime(pd.Series(list(values), dtype=object), errors='coerce').dropna().dt.date}
+
+
+def _pending_dates(local_engine, table_name) -> dict:
+    """로컬 적재/교체 후 아직 원격에 반영되지 않은 날짜 → 읽은 시점의 mark_count (sync_pending)"""
+    df = pd.read_sql(text(f"SELECT sync_date, mark_count FROM {db.SYNC_PENDING_TABLE} WHERE table_name = :t"),
+                     local_engine, params={'t': table_name})
+    dates = pd.to_datetime(df['sync_date'], errors='coerce').dt.date
+    return {d: int(c) for d, c in zip(dates, df['mark_count']) if pd.notna(d)}
+
+
+def _mark_pending(local_engine, table_name, dates):
+    with local_engine.begin() as conn:
+        db.mark_sync_pending(conn, table_name, dates)
+
+
+def _clear_pending(local_engine, table_name, seen: dict):
+    """
+    전송이 끝난 날짜의 기록을 지웁니다.
+    읽은 뒤 다시 기록된 날짜(mark_count 증가)는 남겨 두어 다음 동기화에서 다시 전송합니다.
+    """
+    with local_engine.begin() as conn:
+        for d, count in seen.items():
+            conn.execute(text(
+                f"DELETE FROM {db.SYNC_PENDING_TABLE} WHERE table_name = :t AND sync_date = :d AND mark_count = :c"
+            ), {'t': table_name, 'd': str(d), 'c': count})
+
+
+def _local_dates(local_engine, table_name, date_col, since=None):
+    """로컬 테이블의 날짜 목록 (since가 있으면 since 이상)"""
+    query = f"SELECT DISTINCT {date_col} AS d FROM {table_name}"
+    params = {}
+    if since is not None:
+        query += f" WHERE {date_col} >= :since"
+        params = {'since': str(since)}
+    return _to_dates(pd.read_sql(text(query), local_engine, params=params)['d'])
+
+
+def _prepare_chunk(chunk, remote_cols):
+    for col in db.DATE_COLS:
+        if col in chunk.columns:
+            chunk[col] = pd.to_datetime(chunk[col], errors='coerce').dt.date
+    if remote_cols is not None:
+        chunk = chunk[[c for c in chunk.columns if c in remote_cols]]
+    return chunk
+
+
+def _copy_all(table_name, local_engine, remote_engine, remote_cols, batch_size):
+    """원격이 비어 있을 때: 로컬 전체를 batch_size 단위로 upsert"""
+    sent = 0
+    for chunk in pd.read_sql(text(f"SELECT * FROM {table_name}"), local_engine, chunksize=batch_size):
+        chunk = _prepare_chunk(chunk, remote_cols)
+        if chunk.empty:
+            continue
+        if not db.upsert_dataframe(chunk, table_name, engine=remote_engine, chunksize=batch_size):
+            raise RuntimeError(f"{table_name} 동기화 중단 ({sent}건 전송 후 실패)")
+        sent += len(chunk)
+    return sent
+
+
+def _mirror_date(table_name, date_col, d, local_engine, remote_engine, remote_cols):
+    """원격의 해당 날짜 행을 로컬 행으로 통째로 교체 (로컬에서 삭제된 행도 반영)"""
+    rows = pd.read_sql(text(f"SELECT * FROM {table_name} WHERE {date_col} = :d"),
+                       local_engine, params={'d': str(d)})
+    rows = _prepare_chunk(rows, remote_cols)
+
+    if rows.empty:
+        with remote_engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {table_name} WHERE {date_col} = :d"), {'d': d})
+        return 0
+
+    if not db.replace_date_rows(rows, table_name, d, date_col=date_col, engine=remote_engine):
+        raise RuntimeError(f"{table_name} {d} 교체 실패")
+    return len(rows)
+
+
+def sync_table(table_name, local_engine, remote_engine, batch_size=5000):
+    """
+    로컬 테이블의 변경분을 원격(Postgres)에 반영합니다.
+    - 원격 테이블이 없거나 비어 있으면 전체를 batch_size 단위로 upsert
+    - 그 외에는 sync_pending에 기록된 날짜(당일 재적재, 재처리/백필한 과거 날짜 포함)와
+      원격 기준일(MAX) 이상인 로컬 날짜를 날짜 단위로 교체
+    sync_pending 기록은 해당 날짜의 원격 반영이 커밋된 뒤에만 지우므로,
+    프로세스가 중간에 종료되어도 남은 날짜는 다음 동기화에서 이어서 전송됩니다.
+    전송한 행 수를 반환합니다.
+    """
+    date_col = SYNC_TABLES[table_name]
+    remote_cols = _remote_columns(remote_engine, table_name)
+    wm = None if remote_cols is None else _remote_watermark(remote_engine, table_name, date_col)
+
+    if wm is None:
+        print(f"[SYNC] {table_name}: 원격 데이터 없음 → 전체 전송")
+        # 일부만 전송된 채 중단되면 원격 기준일 비교로 누락되므로, 전송 전에 전체 날짜를 기록해 둠
+        _mark_pending(local_engine, table_name, _local_dates(local_engine, table_name, date_col))
+        pending = _pending_dates(local_engine, table_name)
+        sent = _copy_all(table_name, local_engine, remote_engine, remote_cols, batch_size)
+        _clear_pending(local_engine, table_name, pending)
+        print(f"[SYNC] {table_name}: {sent}건 전송 완료")
+        return sent
+
+    pending = _pending_dates(local_engine, table_name)
+    dates = sorted(set(pending) | _local_dates(local_engine, table_name, date_col, since=wm))
+    print(f"[SYNC] {table_name}: 원격 기준일 {wm} 이상 + 변경 기록 {len(pending)}일 → {len(dates)}일 교체")
+
+    sent = 0
+    for d in dates:
+        sent += _mirror_date(table_name, date_col, d, local_engine, remote_engine, remote_cols)
+        if d in pending:
+            _clear_pending(local_engine, table_name, {d: pending[d]})
+
+    print(f"[SYNC] {table_name}: {sent}건 전송 완료")
+    return sent
+
+
+def sync_to_postgres(tables=None, batch_size=5000, local_backend=None):
+    """로컬 임베디드 DB의 테이블들을 Cloud SQL(Postgres)로 미러링합니다."""
+    local_engine = db.get_engine(local_backend or "sqlite")
+    remote_engine = db.get_engine("postgres")
+
+    # 마이그레이션은 테이블 이름 변경/재생성을 수반하므로 동기화에서 자동 실행하지 않음 (명시적 단계)
+    pending = migrations.pending_migrations(remote_engine)
+    if pending:
+        raise RuntimeError(
+            f"원격 스키마가 마이그레이션되지 않았습니다 (미적용: {', '.join(pending)}). "
+            "먼저 `python cli.py migrate`를 실행하세요."
+        )
+
+    results = {}
+    for table_name in tables or SYNC_TABLES:
+        try:
+            results[table_name] = sync_table(table_name, local_engine, remote_engine, batch_size)
+        except Exception as e:
+            print(f"[SYNC ERROR] {table_name} 동기화 실패: {e}")
+            results[table_name] = None
+    return results
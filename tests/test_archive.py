@@ -0,0 +1,52 @@
+import pytest
+
+from src import archive
+
+
+@pytest.fixture(autouse=True)
+def archive_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, 'ARCHIVE_ROOT', str(tmp_path / 'archive'))
+
+
+def test_writer_reader_round_trip_with_segment_rollover(monkeypatch):
+    monkeypatch.setattr(archive, 'SEGMENT_MAX_BYTES', 64)
+    run_id = archive.new_run_id('weekly')
+    bodies = {f'{i:06d}': bytes(range(256)) * (i + 1) for i in range(5)}
+
+    with archive.ArchiveWriter(run_id, 'weekly', '2026-10-17') as writer:
+        for ticker, body in bodies.items():
+            writer.append('analysis', ticker, body)
+        writer.append('basic', '000000', b'{"a": 1}', date='2026-10-16')
+
+    with archive.ArchiveReader(run_id) as reader:
+        assert reader.meta['job'] == 'weekly'
+        assert str(reader.std_date) == '2026-10-17'
+        assert reader.tickers('analysis') == list(bodies)
+        for ticker, body in bodies.items():
+            assert reader.get('analysis', ticker) == body
+        assert reader.get('basic', '000000', date='2026-10-16') == b'{"a": 1}'
+        assert reader.get('basic', '000000', date='2026-10-17') is None
+        assert reader.get('analysis', 'UNKNOWN') is None
+        # 세그먼트 최대 크기를 넘으면 다음 세그먼트로 넘어감
+        assert len({reader.entries[('analysis', t, '2026-10-17')][0] for t in bodies}) > 1
+
+
+def test_latest_entry_wins_for_repeated_key():
+    run_id = archive.new_run_id('dividends')
+    with archive.ArchiveWriter(run_id, 'dividends') as writer:
+        writer.append('dividend', '069500', b'first')
+        writer.append('dividend', '069500', b'retry')
+
+    with archive.ArchiveReader(run_id) as reader:
+        assert reader.get('dividend', '069500') == b'retry'
+        assert list(reader.iter_endpoint('dividend'))[0][2] == b'retry'
+        assert archive.list_runs('dividends') == [run_id]
+
+
+def test_writer_refuses_existing_run_dir():
+    run_id = archive.new_run_id('daily')
+    archive.ArchiveWriter(run_id, 'daily').close()
+    with pytest.raises(FileExistsError):
+        archive.ArchiveWriter(run_id, 'daily')
+    with pytest.raises(FileNotFoundError):
+        archive.ArchiveReader('daily-19700101-000000-1')
@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# 서브프로세스에서 cli.main을 실행한 뒤, 로드된 무거운 모듈 목록을 마지막 줄에 JSON으로 출력
+_PROBE = """
+import json, sys
+import cli
+try:
+    cli.main({argv!r})
+except SystemExit:
+    pass
+print(json.dumps(sorted(m for m in {modules!r} if m in sys.modules)))
+"""
+
+
+def _loaded_modules(argv, modules):
+    code = _PROBE.format(argv=argv, modules=modules)
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=REPO_ROOT,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('argv', [['--help'], ['health']])
+def test_light_commands_skip_heavy_imports(argv):
+    """--help, health는 pandas/SQLAlchemy 없이 끝나야 함 (헬스체크 속도)"""
+    assert _loaded_modules(argv, ['pandas', 'sqlalchemy', 'scipy']) == []
+
+
+def test_weekly_pipeline_import_skips_scipy():
+    """scipy는 OverlapIndex를 만들 때만 로드"""
+    code = "import sys, run_weekly_analysis; print('scipy' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == 'False'
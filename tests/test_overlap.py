@@ -0,0 +1,43 @@
+import pandas as pd
+
+from src import overlap
+
+
+def _holdings(rows):
+    return pd.DataFrame(rows, columns=['std_date', 'ticker', 'rank', 'holding_code', 'holding_name', 'weight'])
+
+
+def test_holdings_signature_ignores_small_weight_drift():
+    week1 = _holdings([('2026-10-10', '069500', 1, '005930', '삼성전자', 24.31),
+                       ('2026-10-10', '069500', 2, '000660', 'SK하이닉스', 10.02)])
+    week2 = _holdings([('2026-10-17', '069500', 1, '005930', '삼성전자', 24.29),
+                       ('2026-10-17', '069500', 2, '000660', 'SK하이닉스', 10.04)])
+    swapped = _holdings([('2026-10-24', '069500', 1, '005930', '삼성전자', 24.3),
+                         ('2026-10-24', '069500', 2, '373220', 'LG에너지솔루션', 10.0)])
+
+    sig = [overlap.holdings_signature(df)['holdings'].iloc[0] for df in (week1, week2, swapped)]
+
+    assert sig[0] == sig[1]
+    assert sig[0] != sig[2]
+
+
+def test_top_k_ranks_by_metric_and_excludes_self():
+    index = overlap.OverlapIndex(_holdings([
+        (None, 'A', 1, 'X', 'x', 50.0), (None, 'A', 2, 'Y', 'y', 50.0),
+        (None, 'B', 1, 'X', 'x', 50.0), (None, 'B', 2, 'Y', 'y', 50.0),
+        (None, 'C', 1, 'X', 'x', 10.0), (None, 'C', 2, 'Z', 'z', 90.0),
+        (None, 'D', 1, None, 'w', 100.0),
+    ]))
+
+    result = index.top_k('A', k=5)
+    assert result['ticker'].tolist() == ['B', 'C']
+    assert result['cosine'].tolist() == [1.0, round(10 * 50 / (50 * 2 ** 0.5 * (10 ** 2 + 90 ** 2) ** 0.5), 4)]
+    assert result['shared_weight'].tolist() == [100.0, 50.0]
+    assert result['common_count'].tolist() == [2, 1]
+
+    assert index.top_k('A', k=1)['ticker'].tolist() == ['B']
+    by_shared = index.top_k('C', metric='shared_weight')
+    assert sorted(by_shared['ticker']) == ['A', 'B'] and by_shared['shared_weight'].tolist() == [10.0, 10.0]
+    # 코드가 없는 종목은 종목명으로 집계되며, 겹치는 ETF가 없으면 빈 결과
+    assert 'D' in index and index.top_k('D').empty
+    assert index.top_k('UNKNOWN').empty
@@ -0,0 +1,58 @@
+import pytest
+
+from src import ratelimit
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """requests.get 대신 정해진 상태 코드를 순서대로 반환하고, 대기(sleep)는 기록만 함"""
+    state = {'statuses': [], 'gets': 0, 'sleeps': []}
+
+    def fake_get(url, **kwargs):
+        state['gets'] += 1
+        return _Response(state['statuses'].pop(0))
+
+    monkeypatch.setattr(ratelimit.requests, 'get', fake_get)
+    monkeypatch.setattr(ratelimit.time, 'sleep', state['sleeps'].append)
+    return state
+
+
+def test_unusable_state_file_falls_back_to_process_limit(tmp_path, monkeypatch, capsys):
+    blocker = tmp_path / 'not-a-dir'
+    blocker.write_text('')
+    monkeypatch.setattr(ratelimit, 'RATE_LIMIT_DIR', str(blocker / 'sub'))
+
+    bucket = ratelimit.SharedTokenBucket('test', rate=10, burst=1)
+
+    assert bucket._fd is None
+    assert '[WARN]' in capsys.readouterr().out
+    bucket.acquire()
+
+
+def test_throttled_get_retries_once_after_429_wait(tmp_path, monkeypatch, calls):
+    monkeypatch.setattr(ratelimit, 'RATE_LIMIT_DIR', str(tmp_path))
+    bucket = ratelimit.SharedTokenBucket('test', rate=10, burst=1)
+    calls['statuses'] = [429, 200]
+
+    response = ratelimit.throttled_get(bucket, 'http://example.invalid')
+
+    assert response.status_code == 200
+    assert calls['gets'] == 2
+    # 재시도 전에 penalize 대기(THROTTLE_PENALTY_SEC)만큼 기다림
+    assert max(calls['sleeps']) >= ratelimit.THROTTLE_PENALTY_SEC
+    bucket.close()
+
+
+def test_throttled_get_returns_429_after_retry_exhausted(tmp_path, monkeypatch, calls):
+    monkeypatch.setattr(ratelimit, 'RATE_LIMIT_DIR', str(tmp_path))
+    bucket = ratelimit.SharedTokenBucket('test', rate=10, burst=1)
+    calls['statuses'] = [429, 429]
+
+    assert ratelimit.throttled_get(bucket, 'http://example.invalid').status_code == 429
+    assert calls['gets'] == 2
+    bucket.close()
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from src import records, scraper
+
+BASIC = {'itemCode': '069500', 'stockName': 'KODEX 200', 'closePrice': '35,120', 'fluctuationsRatio': '-0.45',
+         'unused': {'nested': [1, 2, 3]}}
+
+ANALYSIS = {
+    'nav': 35130.5, 'marketValue': 81234, 'totalFee': 0.15, 'deviationRate': -0.03,
+    'issuerName': '삼성자산운용', 'listedDate': '20021014', 'etfBaseIndex': '코스피 200', 'chaseErrorRate': 0.12,
+    'themeReturns': {'returnRate1m': 1.2, 'returnRate6m': None, 'returnRate1y': 25.3},
+    'dividend': {'dividendYieldTtm': 1.4},
+    'cumulativeNetInflowList': {'cumulativeNetInflow1m': 1200},
+    'etfTop10MajorConstituentAssets': [
+        {'itemCode': '005930', 'itemName': '삼성전자', 'etfWeight': '24.5%'},
+        {'itemCode': None, 'itemName': 'APPLE INC', 'etfWeight': 3},
+    ],
+    'sectorPortfolioList': [{'detailTypeCode': 'IT', 'weight': 38.9}, {'detailTypeCode': '금융', 'weight': 10.1}],
+    'countryPortfolioList': [{'detailTypeCode': '한국', 'weight': 99.0}],
+    'unusedLargeList': [{'x': i} for i in range(100)],
+}
+
+DECODE_PATHS = ['msgspec', 'orjson', 'json']
+
+
+@pytest.fixture(params=DECODE_PATHS)
+def decode_path(request, monkeypatch):
+    """records의 디코더 선택을 한 경로로 고정"""
+    if request.param == 'msgspec':
+        pytest.importorskip('msgspec')
+    else:
+        monkeypatch.setattr(records, '_DECODERS', {})
+        if request.param == 'orjson':
+            pytest.importorskip('orjson')
+        else:
+            monkeypatch.setattr(records, 'orjson', None)
+    return request.param
+
+
+def _parse(body_basic, body_analysis):
+    basic = scraper.parse_etf_basic(records.decode_payload(body_basic, 'basic'))
+    analysis = scraper.parse_etf_analysis(records.decode_payload(body_analysis, 'analysis'))
+    return basic, analysis
+
+
+def test_decode_paths_produce_identical_records(decode_path):
+    basic, analysis = _parse(json.dumps(BASIC).encode(), json.dumps(ANALYSIS, ensure_ascii=False).encode())
+
+    # 기준: 표준 json으로 파싱한 dict를 그대로 파서에 넣은 결과
+    expected_basic = scraper.parse_etf_basic(BASIC)
+    expected_analysis = scraper.parse_etf_analysis(ANALYSIS)
+
+    assert basic.to_dict() == expected_basic.to_dict()
+    assert analysis.to_dict() == expected_analysis.to_dict()
+    assert basic.price == 35120
+    assert analysis.sector_weight == 'IT(38.9%), 금융(10.1%)'
+
+
+@pytest.mark.parametrize('body, expected', [(b'null', None), (b'[1, 2]', [1, 2]), (b'"x"', 'x')])
+def test_non_object_payload_falls_back_to_plain_parse(decode_path, body, expected):
+    assert records.decode_payload(body, 'basic') == expected
+    assert records.decode_payload(body, 'analysis') == expected
+    assert scraper.parse_etf_basic(records.decode_payload(b'null', 'basic')) is None
+
+
+def test_invalid_json_raises(decode_path):
+    with pytest.raises(ValueError):
+        records.decode_payload(b'{not json', 'basic')
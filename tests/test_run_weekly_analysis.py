@@ -0,0 +1,77 @@
+import json
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import run_weekly_analysis
+from src import archive, db, ratelimit
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """data/ 하위 경로(아카이브, CSV, 로컬 DB)를 임시 디렉터리로"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('DB_BACKEND', 'sqlite')
+    monkeypatch.setenv('LOCAL_DB_PATH', str(tmp_path / 'etf.db'))
+    return tmp_path
+
+
+def _archive_week(run_id, std_date, etfs):
+    """etfs: {ticker: (price, fee, it_weight, [(holding_code, weight), ...])}"""
+    with archive.ArchiveWriter(run_id, 'weekly', std_date) as writer:
+        for ticker, (price, fee, it_weight, holdings) in etfs.items():
+            writer.append('basic', ticker, json.dumps({
+                'itemCode': ticker, 'stockName': ticker, 'closePrice': str(price),
+            }).encode())
+            writer.append('analysis', ticker, json.dumps({
+                'marketValue': price * 10, 'totalFee': fee, 'issuerName': '삼성자산운용',
+                'sectorPortfolioList': [{'detailTypeCode': 'IT', 'weight': it_weight},
+                                        {'detailTypeCode': '금융', 'weight': 100 - it_weight}],
+                'etfTop10MajorConstituentAssets': [
+                    {'itemCode': code, 'itemName': code, 'etfWeight': weight} for code, weight in holdings
+                ],
+            }, ensure_ascii=False).encode())
+
+
+def _versions(table):
+    df = pd.read_sql(text(f"SELECT DISTINCT std_date, ticker FROM {table} ORDER BY std_date, ticker"), db.get_engine())
+    return [tuple(r) for r in df.itertuples(index=False)]
+
+
+def test_replay_writes_only_changed_profile_and_holdings_versions(workdir):
+    _archive_week('weekly-20261010-090000-1', date(2026, 10, 10), {
+        '069500': (100, 0.15, 38.9, [('005930', 24.31), ('000660', 10.02)]),
+        '360750': (200, 0.07, 60.0, [('AAPL', 7.0)]),
+    })
+    # 다음 주: 069500은 비중만 소수점 단위로 흔들림, 360750은 보수와 구성 종목이 바뀜
+    _archive_week('weekly-20261017-090000-1', date(2026, 10, 17), {
+        '069500': (101, 0.15, 39.2, [('005930', 24.29), ('000660', 10.04)]),
+        '360750': (201, 0.05, 60.0, [('MSFT', 6.5)]),
+    })
+
+    run_weekly_analysis.run(replay_run_id='weekly-20261010-090000-1')
+    run_weekly_analysis.run(replay_run_id='weekly-20261017-090000-1')
+    # 같은 주를 다시 재처리해도 결과가 같아야 함
+    run_weekly_analysis.run(replay_run_id='weekly-20261017-090000-1')
+
+    assert _versions('etf_analysis') == [
+        ('2026-10-10', '069500'), ('2026-10-10', '360750'),
+        ('2026-10-17', '069500'), ('2026-10-17', '360750'),
+    ]
+    assert _versions('etf_profile') == [('2026-10-10', '069500'), ('2026-10-10', '360750'), ('2026-10-17', '360750')]
+    assert _versions('etf_holdings') == [('2026-10-10', '069500'), ('2026-10-10', '360750'), ('2026-10-17', '360750')]
+
+
+def test_scrape_surfaces_rate_limit_config_error(monkeypatch):
+    """NAVER_RATE_LIMIT=0 같은 설정 오류는 종목별 예외 처리에 묻히지 않고 바로 드러나야 함"""
+    monkeypatch.setattr(ratelimit, 'NAVER_RATE_LIMIT', 0.0)
+    monkeypatch.setattr(ratelimit, '_BUCKETS', {})
+
+    def fail_fetch(*args, **kwargs):
+        raise AssertionError("버킷 설정 오류 전에 요청하면 안 됨")
+    monkeypatch.setattr(run_weekly_analysis.scraper, 'fetch_etf_basic', fail_fetch)
+
+    with pytest.raises(ValueError):
+        run_weekly_analysis._scrape(['069500'], writer=None)
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from src import schema
+
+
+def _krx(**overrides):
+    row = {'기준일자': '20261016', '단축코드': '69500', '한글종목명': 'KODEX 200', '종가_KRX': '35,120',
+           '시가총액': '8,123,456,789,000', '등락률': '-0.45', '거래량': '-'}
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+def test_apply_krx_schema_coerces_strings_with_commas():
+    df = schema.apply_krx_schema(_krx())
+
+    assert df['기준일자'].iloc[0] == pd.Timestamp('2026-10-16')
+    assert df['단축코드'].iloc[0] == '069500'
+    assert str(df['단축코드'].dtype) == 'category'
+    assert df['종가_KRX'].iloc[0] == 35120 and str(df['종가_KRX'].dtype) == 'Int32'
+    assert df['시가총액'].iloc[0] == 8123456789000 and str(df['시가총액'].dtype) == 'Int64'
+    assert df['등락률'].iloc[0] == pytest.approx(-0.45)
+    # '-'는 원래 결측이므로 경고 대상이 아님
+    assert pd.isna(df['거래량'].iloc[0])
+
+
+def test_apply_krx_schema_rejects_bad_tickers():
+    with pytest.raises(ValueError, match="잘못된 종목코드"):
+        schema.apply_krx_schema(_krx(단축코드='12345678'))
+
+
+def test_apply_krx_schema_requires_columns():
+    with pytest.raises(ValueError, match="필수 컬럼"):
+        schema.apply_krx_schema(_krx().drop(columns=['종가_KRX']))
+
+
+def test_apply_schema_warns_for_values_lost_in_conversion(capsys):
+    df = schema.apply_krx_schema(_krx(종가_KRX='abc', 거래량='-'))
+
+    out = capsys.readouterr().out
+    assert pd.isna(df['종가_KRX'].iloc[0])
+    assert "[SCHEMA WARN] krx_daily.종가_KRX: 1건" in out
+    assert "거래량" not in out
@@ -0,0 +1,22 @@
+from src import scraper
+
+
+def test_parse_constituents_keeps_top_n_and_parses_weights():
+    items = [
+        {'itemCode': '005930', 'itemName': '삼성전자', 'etfWeight': '24.5%'},
+        {'itemCode': '000660', 'itemName': 'SK하이닉스', 'weight': '1,234.5'},
+        {'itemCode': None, 'itemName': 'APPLE INC', 'etfWeight': 7},
+        {'itemCode': '035420', 'itemName': 'NAVER', 'etfWeight': 'N/A'},
+    ]
+
+    assert scraper._parse_constituents(items, top_n=3) == [
+        {'rank': 1, 'holding_code': '005930', 'holding_name': '삼성전자', 'weight': 24.5},
+        {'rank': 2, 'holding_code': '000660', 'holding_name': 'SK하이닉스', 'weight': 1234.5},
+        {'rank': 3, 'holding_code': None, 'holding_name': 'APPLE INC', 'weight': 7.0},
+    ]
+    assert scraper._parse_constituents(items)[3]['weight'] is None
+
+
+def test_parse_constituents_empty():
+    assert scraper._parse_constituents(None) == []
+    assert scraper._parse_constituents([]) == []
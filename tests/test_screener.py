@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from src import db
+from src.screener import ScreeningEngine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'etf.db'}")
+    db.init_local_schema(engine)
+    return engine
+
+
+def _analysis(std_date, rows):
+    return pd.DataFrame([
+        {'std_date': pd.Timestamp(std_date), 'ticker': ticker, 'name': ticker, 'price': price, 'market_cap': cap}
+        for ticker, price, cap in rows
+    ])
+
+
+def _profile(std_date, rows):
+    return pd.DataFrame([
+        {'std_date': pd.Timestamp(std_date), 'ticker': ticker, 'issuer': issuer, 'fee': fee,
+         'country_1': country, 'country_1_pct': pct}
+        for ticker, issuer, fee, country, pct in rows
+    ])
+
+
+def test_apply_changes_updates_numeric_and_categorical_values():
+    snapshot = pd.DataFrame({
+        'ticker': ['069500', '360750'], 'name': ['A', 'B'],
+        'price': [100.0, 200.0], 'issuer': ['삼성', '미래'],
+        'std_date': pd.to_datetime(['2026-10-17'] * 2),
+    })
+    engine = ScreeningEngine(snapshot)
+
+    engine.apply_changes(pd.DataFrame({'ticker': ['069500'], 'name': ['A2'], 'price': [300.0], 'issuer': ['미래']}))
+
+    result = engine.query(eq={'issuer': '미래'}, order_by='price', columns=['ticker', 'name', 'price'])
+    assert result.to_dict('records') == [
+        {'ticker': '069500', 'name': 'A2', 'price': 300.0},
+        {'ticker': '360750', 'name': 'B', 'price': 200.0},
+    ]
+
+
+def test_refresh_from_db_applies_new_week_incrementally(engine):
+    db.upsert_dataframe(_analysis('2026-10-17', [('069500', 100.0, 1000.0), ('360750', 200.0, 500.0)]),
+                        'etf_analysis', engine=engine)
+    db.upsert_dataframe(_profile('2026-10-17', [('069500', '삼성', 0.15, '한국', 99.0),
+                                                ('360750', '미래', 0.07, '미국', 98.0)]),
+                        'etf_profile', engine=engine)
+
+    screener = ScreeningEngine.from_db(engine)
+    assert screener.query(order_by='market_cap', columns=['ticker'])['ticker'].tolist() == ['069500', '360750']
+
+    # 다음 주: 지표는 전 종목, 속성은 바뀐 종목(360750)만 새 버전 → 기존 행 값만 교체되는 경로
+    db.upsert_dataframe(_analysis('2026-10-24', [('069500', 110.0, 900.0), ('360750', 210.0, 1500.0)]),
+                        'etf_analysis', engine=engine)
+    db.upsert_dataframe(_profile('2026-10-24', [('360750', '미래', 0.05, '미국', 97.0)]),
+                        'etf_profile', engine=engine)
+
+    screener.refresh_from_db(engine)
+
+    columns = ['ticker', 'price', 'market_cap', 'fee', 'country_1']
+    assert screener.query(order_by='market_cap', columns=columns).to_dict('records') == [
+        {'ticker': '360750', 'price': 210.0, 'market_cap': 1500.0, 'fee': 0.05, 'country_1': '미국'},
+        {'ticker': '069500', 'price': 110.0, 'market_cap': 900.0, 'fee': 0.15, 'country_1': '한국'},
+    ]
+    assert screener.as_of == pd.Timestamp('2026-10-24')
+
+    # 그다음 주: 신규 종목 추가
+    db.upsert_dataframe(_analysis('2026-10-31', [('069500', 120.0, 800.0), ('360750', 220.0, 1600.0),
+                                                 ('0000D0', 10.0, 50.0)]),
+                        'etf_analysis', engine=engine)
+    db.upsert_dataframe(_profile('2026-10-31', [('0000D0', '한화', 0.3, '한국', 100.0)]),
+                        'etf_profile', engine=engine)
+
+    screener.refresh_from_db(engine)
+
+    result = screener.query(order_by='market_cap', columns=columns)
+    assert result['ticker'].tolist() == ['360750', '069500', '0000D0']
+
+    # 증분 결과가 DB 전체 재적재 결과와 같아야 함
+    rebuilt = ScreeningEngine.from_db(engine).query(order_by='market_cap', columns=columns)
+    pd.testing.assert_frame_equal(result, rebuilt)
+
+
+def test_snapshot_uses_latest_week_and_refresh_drops_missing_tickers(engine):
+    db.upsert_dataframe(_analysis('2026-10-17', [('069500', 100.0, 1000.0), ('360750', 200.0, 500.0)]),
+                        'etf_analysis', engine=engine)
+    db.upsert_dataframe(_profile('2026-10-17', [('069500', '삼성', 0.15, '한국', 99.0),
+                                                ('360750', '미래', 0.07, '미국', 98.0)]),
+                        'etf_profile', engine=engine)
+    screener = ScreeningEngine.from_db(engine)
+
+    # 다음 주 360750 상장폐지(또는 수집 실패): 지난주 행은 DB에 남지만 최신 스냅샷에는 없음
+    db.upsert_dataframe(_analysis('2026-10-24', [('069500', 110.0, 900.0)]), 'etf_analysis', engine=engine)
+
+    screener.refresh_from_db(engine)
+
+    columns = ['ticker', 'price', 'fee']
+    expected = [{'ticker': '069500', 'price': 110.0, 'fee': 0.15}]
+    assert screener.query(columns=columns).to_dict('records') == expected
+    assert '360750' not in screener._row_of
+    assert ScreeningEngine.from_db(engine).query(columns=columns).to_dict('records') == expected
@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from src import db, sync
+
+
+@pytest.fixture(params=['sqlite', 'duckdb'])
+def engines(request, tmp_path):
+    if request.param == 'duckdb':
+        pytest.importorskip('duckdb_engine')
+    local = create_engine(f"{request.param}:///{tmp_path / 'local.db'}")
+    remote = create_engine(f"sqlite:///{tmp_path / 'remote.db'}")
+    db.init_local_schema(local)
+    db.init_local_schema(remote)
+    return local, remote
+
+
+def _prices(std_date, rows):
+    return pd.DataFrame([
+        {'std_date': pd.Timestamp(std_date), 'ticker': ticker, 'name': ticker, 'close_price': price}
+        for ticker, price in rows
+    ])
+
+
+def _remote_prices(remote):
+    df = pd.read_sql(text("SELECT std_date, ticker, close_price FROM etf_daily_price ORDER BY std_date, ticker"),
+                     remote)
+    return [(str(d)[:10], t, p) for d, t, p in df.itertuples(index=False)]
+
+
+def test_sync_mirrors_same_day_rewrites_and_older_date_replays(engines):
+    local, remote = engines
+    db.upsert_dataframe(_prices('2026-10-15', [('069500', 100.0), ('360750', 200.0)]), 'etf_daily_price', engine=local)
+    db.upsert_dataframe(_prices('2026-10-16', [('069500', 101.0)]), 'etf_daily_price', engine=local)
+
+    assert sync.sync_table('etf_daily_price', local, remote) == 3
+    assert sync._pending_dates(local, 'etf_daily_price') == {}
+
+    # 같은 날 재적재(기준일 = 원격 MAX) + 과거 날짜 재처리(행 삭제 포함)
+    db.upsert_dataframe(_prices('2026-10-16', [('069500', 102.0), ('360750', 202.0)]), 'etf_daily_price', engine=local)
+    db.replace_date_rows(_prices('2026-10-15', [('069500', 99.0)]), 'etf_daily_price', '2026-10-15', engine=local)
+
+    sync.sync_table('etf_daily_price', local, remote)
+
+    assert _remote_prices(remote) == [
+        ('2026-10-15', '069500', 99.0),
+        ('2026-10-16', '069500', 102.0),
+        ('2026-10-16', '360750', 202.0),
+    ]
+    assert sync._pending_dates(local, 'etf_daily_price') == {}
+
+
+def test_interrupted_sync_keeps_unsent_and_remarked_dates(engines, monkeypatch):
+    local, remote = engines
+    db.upsert_dataframe(_prices('2026-10-16', [('069500', 101.0)]), 'etf_daily_price', engine=local)
+    sync.sync_table('etf_daily_price', local, remote)
+
+    # 원격 기준일보다 이전 날짜 두 개를 백필
+    db.upsert_dataframe(_prices('2026-09-01', [('069500', 90.0)]), 'etf_daily_price', engine=local)
+    db.upsert_dataframe(_prices('2026-09-02', [('069500', 91.0)]), 'etf_daily_price', engine=local)
+
+    mirror = sync._mirror_date
+
+    def killed_after_first_date(table_name, date_col, d, *args):
+        if str(d) == '2026-09-02':
+            raise KeyboardInterrupt  # cron 타임아웃 등으로 중단
+        sent = mirror(table_name, date_col, d, *args)
+        # 전송 중 같은 날짜가 로컬에 다시 적재됨
+        db.upsert_dataframe(_prices(d, [('069500', 95.0)]), 'etf_daily_price', engine=local)
+        return sent
+
+    monkeypatch.setattr(sync, '_mirror_date', killed_after_first_date)
+    with pytest.raises(KeyboardInterrupt):
+        sync.sync_table('etf_daily_price', local, remote)
+    monkeypatch.setattr(sync, '_mirror_date', mirror)
+
+    assert sorted(str(d) for d in sync._pending_dates(local, 'etf_daily_price')) == ['2026-09-01', '2026-09-02']
+
+    sync.sync_table('etf_daily_price', local, remote)
+
+    assert _remote_prices(remote) == [
+        ('2026-09-01', '069500', 95.0),
+        ('2026-09-02', '069500', 91.0),
+        ('2026-10-16', '069500', 101.0),
+    ]
+    assert sync._pending_dates(local, 'etf_daily_price') == {}